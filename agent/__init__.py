@@ -4,3 +4,4 @@ The agent module provides some sample agents that can learn from a bandit.
 from .base_agent import BaseAgent
 from .epsilon_greedy import EpsilonGreedy
 from .greedy import Greedy
+from .hierarchical import Hierarchical
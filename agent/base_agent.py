@@ -1,5 +1,6 @@
 import abc
 import numpy
+from typing import Optional
 
 
 class BaseAgent(abc.ABC):
@@ -10,21 +11,62 @@ class BaseAgent(abc.ABC):
     agent must define when implemented. This ensures consistent API across each agent type.
     """
 
-    def __init__(self, k: int, start_value: float = 0.0) -> None:
+    def __init__(self, k: int, start_value: float = 0.0, step_size: Optional[float] = None,
+                 window: Optional[int] = None, dtype=numpy.float64,
+                 rng: Optional[numpy.random.Generator] = None) -> None:
         """
         Construct the agent.
 
+        By default, the Q-table holds the sample average of all rewards received for each action. For nonstationary
+        bandits, either a constant step size or a sliding window can be provided instead so that recent rewards carry
+        more weight. Only one of the two may be given.
         @param k The number of possible actions the agent can pick from at any given time. Must be an int greater than
         zero.
         @param start_value An initial value to use for each possible action. This assumes that each action is equally
         likely at start, so all values in the Q-table are set to this value.
-        @exception ValueError if k is not an integer greater than 0.
+        @param step_size If provided, a constant step size (alpha) on the interval (0, 1] used to produce an
+        exponential recency-weighted average of the rewards for each action.
+        @param window If provided, an int greater than zero. Each action's value is the mean of only its most recent
+        window rewards.
+        @param dtype The floating point type used to store the Q-table and any other reward estimates. float32 halves
+        the memory used compared to the default of float64.
+        @param rng The random number generator to use for any random decisions. If not provided, a new one is created.
+        Giving each agent its own generator allows agents to be run in parallel threads.
+        @exception ValueError if k is not an integer greater than 0, if step_size or window are out of range, if
+        both step_size and window are provided, or if dtype is not a floating point type.
         """
         super().__init__()
         # Create a Q-table with size k.
         if k <= 0:
             raise ValueError('k must be an integer greater than zero.')
-        self._table = start_value * numpy.ones(shape=(k,), dtype=numpy.float)
+        if step_size is not None and window is not None:
+            raise ValueError('Only one of step_size and window may be provided.')
+        if step_size is not None and (step_size <= 0.0 or step_size > 1.0):
+            raise ValueError('step_size must be on the interval (0, 1].')
+        if window is not None and (not isinstance(window, int) or window <= 0):
+            raise ValueError('window must be an integer greater than zero.')
+        dtype = numpy.dtype(dtype)
+        if not numpy.issubdtype(dtype, numpy.floating):
+            raise ValueError('dtype must be a floating point type.')
+        self._start_value = start_value
+        # Per Numpy documentation, this is the preferred way to sample from random distributions.
+        self._rng = numpy.random.default_rng() if rng is None else rng
+        self._step_size = step_size
+        self._window = window
+        self._table = numpy.empty(shape=(k,), dtype=dtype)
+        # Track how many rewards each action has received. This is used by the sample average and to know when an
+        # action's window has filled up.
+        self._counts = numpy.empty(shape=(k,), dtype=numpy.int64)
+        if window is not None:
+            # Each action gets a ring buffer of its most recent rewards, along with the running sum of the buffer and
+            # the position of the oldest entry. This keeps each update O(1) regardless of the window length.
+            self._window_rewards = numpy.empty(shape=(k, window), dtype=dtype)
+            self._window_sums = numpy.empty(shape=(k,), dtype=dtype)
+            self._window_positions = numpy.empty(shape=(k,), dtype=numpy.int64)
+        # Scratch space for breaking ties in exploit. Reusing these avoids creating new arrays on every step.
+        self._tie_mask = numpy.empty(shape=(k,), dtype=bool)
+        self._tie_counts = numpy.empty(shape=(k,), dtype=numpy.intp)
+        self.reset()
 
     @abc.abstractmethod
     def act(self) -> int:
@@ -36,22 +78,23 @@ class BaseAgent(abc.ABC):
         @return An int representing which arm action to take. This int should be between [0, k).
         """
 
+    @property
+    def dtype(self) -> numpy.dtype:
+        """
+        Return the floating point type of the Q-table.
+        @return A numpy dtype.
+        """
+        return self._table.dtype
+
     def exploit(self) -> int:
         """
         Select the best action.
 
-        This will use the Q-table to select the action with the highest likelihood. Ties are broken arbitrarily.
+        This will use the Q-table to select the action with the highest likelihood. Ties are broken randomly. No new
+        arrays are created, so this can be called on every step without allocating memory.
         @return An int representing which arm action to take. This int will be between [0, k).
         """
-        # Argmax will return all the highest arguments as an array. If there is only a single highest, argmax will
-        # just return a single value. Otherwise, use choice to pick amongst all the indices.
-        possible_actions = numpy.argmax(a=self.table)
-        if possible_actions.size == 1:
-            selected_action = possible_actions
-        else:
-            # Default of choice is to pick a single value
-            selected_action = numpy.random.choice(a=possible_actions)
-        return selected_action
+        return self._argmax(self._table, self._tie_mask, self._tie_counts)
 
     def explore(self) -> int:
         """
@@ -60,9 +103,31 @@ class BaseAgent(abc.ABC):
         This will select a random action to take from the Q-table, to explore the decision space more.
         @return An int representing which arm action to take. This int will be between [0, k).
         """
-        # Just pick a random action. When provided a single value, choice chooses from the range [0, k), so use the
-        # size of the table as the input to choice.
-        return numpy.random.choice(a=self.table.size, size=1)
+        # Just pick a random action. When provided a single value, integers chooses from the range [0, k), so use the
+        # size of the table as the input.
+        return int(self._rng.integers(self.table.size))
+
+    def reset(self) -> None:
+        """
+        Return the agent to its initial state.
+
+        This sets every value in the Q-table back to the starting value and forgets all previously received rewards.
+        This allows the same agent to be used across several independent trials.
+        """
+        self._table.fill(self._start_value)
+        self._counts.fill(0)
+        if self._window is not None:
+            self._window_rewards.fill(0.0)
+            self._window_sums.fill(0.0)
+            self._window_positions.fill(0)
+
+    @property
+    def step_size(self) -> Optional[float]:
+        """
+        Return the constant step size used for updates.
+        @return The step size as a float, or None if one is not used.
+        """
+        return self._step_size
 
     @property
     def table(self) -> numpy.ndarray:
@@ -82,3 +147,64 @@ class BaseAgent(abc.ABC):
         @param action An int representing which arm action was taken. This should be between [0, k].
         @param reward A float representing the resulting reward obtained from the selected action.
         """
+
+    @property
+    def window(self) -> Optional[int]:
+        """
+        Return the length of the sliding window used for updates.
+        @return The window length as an int, or None if one is not used.
+        """
+        return self._window
+
+    def _argmax(self, values: numpy.ndarray, tie_mask: numpy.ndarray, tie_counts: numpy.ndarray) -> int:
+        """
+        Find the index of the highest value, breaking ties randomly.
+
+        @param values A one dimensional array of values to search.
+        @param tie_mask A bool array of the same size as values, used as scratch space.
+        @param tie_counts An int array of the same size as values, used as scratch space.
+        @return The index of one of the highest values, as an int.
+        """
+        # Argmax only returns the first of the highest values, so mark every entry equal to it to find any ties.
+        best_index = int(values.argmax())
+        numpy.equal(values, values[best_index], out=tie_mask)
+        ties = numpy.count_nonzero(tie_mask)
+        if ties == 1:
+            return best_index
+        # Number the tied entries by counting them along the array, then find the first entry to reach a randomly
+        # picked number. These are all done in place, since other methods like compress create temporary arrays.
+        numpy.copyto(tie_counts, tie_mask)
+        numpy.add.accumulate(tie_counts, out=tie_counts)
+        return int(tie_counts.searchsorted(self._rng.integers(ties) + 1))
+
+    def _updateTable(self, action: int, reward: float) -> None:
+        """
+        Incorporate a single reward into the Q-table entry for an action.
+
+        Depending on how the agent was constructed, this uses a sample average of every reward for the action, an
+        exponential recency-weighted average with a constant step size, or the mean of a sliding window of the most
+        recent rewards. Each of these takes constant time.
+        @param action An int representing which arm action was taken. This should be between [0, k).
+        @param reward A float representing the resulting reward obtained from the selected action.
+        """
+        if self._step_size is not None:
+            self._table[action] += self._step_size * (reward - self._table[action])
+        elif self._window is not None:
+            position = self._window_positions[action]
+            if self._counts[action] < self._window:
+                self._counts[action] += 1
+                self._window_sums[action] += reward
+            else:
+                # The window is full, so the oldest reward drops out of the running sum.
+                self._window_sums[action] += reward - self._window_rewards[action, position]
+            self._window_rewards[action, position] = reward
+            position = (position + 1) % self._window
+            self._window_positions[action] = position
+            if position == 0:
+                # Once per pass through the buffer, recompute the sum from scratch so that rounding error from the
+                # running additions and subtractions can't accumulate. This keeps the amortized cost constant.
+                self._window_sums[action] = self._window_rewards[action].sum()
+            self._table[action] = self._window_sums[action] / self._counts[action]
+        else:
+            self._counts[action] += 1
+            self._table[action] += (reward - self._table[action]) / self._counts[action]
@@ -1,5 +1,6 @@
 import numpy
 from agent import BaseAgent
+from typing import Optional
 
 
 class EpsilonGreedy(BaseAgent):
@@ -11,7 +12,9 @@ class EpsilonGreedy(BaseAgent):
     options.
     """
 
-    def __init__(self, k: int, epsilon: float, start_value: float = 0.0) -> None:
+    def __init__(self, k: int, epsilon: float, start_value: float = 0.0, step_size: Optional[float] = None,
+                 window: Optional[int] = None, dtype=numpy.float64,
+                 rng: Optional[numpy.random.Generator] = None) -> None:
         """
         Construct the agent.
 
@@ -19,14 +22,15 @@ class EpsilonGreedy(BaseAgent):
         @param epsilon The rate at which actions should randomly explore. As this is a probability, it should be between
         0 and 1.
         @param start_value The initial value to use in the table. All actions start with the same value.
+        @param step_size If provided, use this constant step size instead of a sample average when updating.
+        @param window If provided, use the mean of this many most recent rewards for each action when updating.
+        @param dtype The floating point type of the table, such as numpy.float32 or numpy.float64.
+        @param rng The random number generator to use. If not provided, a new one is created.
         @exception ValueError if epsilon is not a valid probability (between 0 and 1).
         """
-        super().__init__(k, start_value=start_value)
+        super().__init__(k, start_value=start_value, step_size=step_size, window=window, dtype=dtype,
+                         rng=rng)
         self.epsilon = epsilon
-        # Track how many selections have been made to use in the update formula.
-        self._n = 0
-        # Per Numpy documentation, this is the preferred way to sample from random distributions.
-        self._rng = numpy.random.default_rng()
 
     def act(self) -> int:
         """
@@ -36,9 +40,8 @@ class EpsilonGreedy(BaseAgent):
         values at a rate of (1.0 - epsilon).
         @return The index of the selected action to take. Gauranteed to be an int on the range [0, k).
         """
-        # Decide if the agent should explore or exploit using epsilon
-        samples = self._rng.binomial(n=1, p=self.epsilon, size=1)
-        should_explore = (samples[0] == 1)
+        # Decide if the agent should explore or exploit using epsilon. A single uniform draw avoids creating an array.
+        should_explore = (self._rng.random() < self.epsilon)
         if should_explore:
             action = self.explore()
         else:
@@ -60,9 +63,9 @@ class EpsilonGreedy(BaseAgent):
         """
         Update the Q-table based on the last action.
 
-        This will use an incremental formulation of the mean of all rewards obtained so far as the values of the table.
+        This will use an incremental formulation of the mean of all rewards obtained so far as the values of the table,
+        unless a step size or window was provided at construction.
         @param action An index representing which action on the table was selected. It must be between [0, k).
         @param reward The reward obtained from this action.
         """
-        self._n += 1
-        self.table[action] += (reward - self.table[action]) / self._n
+        self._updateTable(action, reward)
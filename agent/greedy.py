@@ -1,4 +1,6 @@
+import numpy
 from agent import BaseAgent
+from typing import Optional
 
 
 class Greedy(BaseAgent):
@@ -9,16 +11,21 @@ class Greedy(BaseAgent):
     never explores, so will likely quickly converge on a single action.
     """
 
-    def __init__(self, k: int, start_value: float = 0.0) -> None:
+    def __init__(self, k: int, start_value: float = 0.0, step_size: Optional[float] = None,
+                 window: Optional[int] = None, dtype=numpy.float64,
+                 rng: Optional[numpy.random.Generator] = None) -> None:
         """
         Construct the agent.
 
         @param k The number of arms to select from. Should be an int greater than zero.
         @param start_value The starting reward to use for each arm. All arms assume the same value at the start.
+        @param step_size If provided, use this constant step size instead of a sample average when updating.
+        @param window If provided, use the mean of this many most recent rewards for each arm when updating.
+        @param dtype The floating point type of the table, such as numpy.float32 or numpy.float64.
+        @param rng The random number generator to use. If not provided, a new one is created.
         """
-        super().__init__(k, start_value=start_value)
-        # Track how many selections have been made to use in the update formula.
-        self._n = 0
+        super().__init__(k, start_value=start_value, step_size=step_size, window=window, dtype=dtype,
+                         rng=rng)
 
     def act(self) -> int:
         """
@@ -33,9 +40,9 @@ class Greedy(BaseAgent):
         """
         Update the table values based on the last action.
 
-        This uses an iterative version of a running average to update table values.
+        This uses an iterative version of a running average to update table values, unless a step size or window was
+        provided at construction.
         @param action The index corresponding to the action that was taken.
         @param reward The resulting reward that was earned.
         """
-        self._n += 1
-        self.table[action] += (reward - self.table[action]) / self._n
+        self._updateTable(action, reward)
@@ -0,0 +1,125 @@
+import numpy
+from agent import EpsilonGreedy
+from bandit import clusterBounds
+from typing import Optional, Sequence
+
+
+class Hierarchical(EpsilonGreedy):
+    """
+    An epsilon greedy agent that picks a cluster of arms, then an arm within it.
+
+    This is meant for a very large number of arms that are grouped into clusters with similar values, such as those of
+    the Clustered bandit. The arms are split into clusters of contiguous arms in the same way, or with the bounds of the
+    bandit itself, such as Hierarchical(k, epsilon, bounds=bandit.bounds), so that they line up. The agent keeps a value
+    for each cluster, which is the average of every reward received from any arm in it, as well as the usual value for
+    each arm. To act, it picks a cluster, exploring at a rate of epsilon and otherwise picking the best one. It then
+    picks an arm within that cluster the same way. So a good cluster can be found from a few rewards, without trying
+    each of its arms.
+
+    Each decision only searches the cluster values and the arm values of one cluster. With the default of the square
+    root of k clusters, acting and updating both take O(sqrt(k)) time, rather than the O(k) of searching every arm.
+    """
+
+    def __init__(self, k: int, epsilon: float, clusters: Optional[int] = None, bounds: Optional[Sequence[int]] = None,
+                 start_value: float = 0.0, step_size: Optional[float] = None, dtype=numpy.float64,
+                 rng: Optional[numpy.random.Generator] = None) -> None:
+        """
+        Construct the agent.
+
+        @param k The number of actions to consider. This must be an int greater than zero.
+        @param epsilon The rate at which clusters, and arms within them, should be explored. As this is a probability,
+        it should be between 0 and 1.
+        @param clusters The number of clusters to group the arms into, split as by bandit.clusterBounds. This must be
+        an int between 1 and k. If neither this nor bounds is provided, the square root of k, rounded, is used.
+        @param bounds Where each cluster starts and ends, such as the bounds of a Clustered bandit. Cluster i holds the
+        arms on the interval [bounds[i], bounds[i + 1]). These must be increasing ints starting at 0 and ending at k.
+        This can not be given along with clusters.
+        @param start_value The initial value to use for every arm and cluster.
+        @param step_size If provided, use this constant step size instead of a sample average when updating both arms
+        and clusters.
+        @param dtype The floating point type of the tables, such as numpy.float32 or numpy.float64.
+        @param rng The random number generator to use. If not provided, a new one is created.
+        @exception ValueError if clusters or bounds are invalid, or for any of the reasons given by @ref EpsilonGreedy.
+        """
+        if bounds is None:
+            self._bounds = clusterBounds(k, clusters)
+        else:
+            if clusters is not None:
+                raise ValueError('Only one of clusters and bounds can be given.')
+            self._bounds = numpy.array(bounds)
+            if (not numpy.issubdtype(self._bounds.dtype, numpy.integer) or self._bounds.ndim != 1 or
+                    self._bounds.size < 2 or self._bounds[0] != 0 or self._bounds[-1] != k or
+                    (numpy.diff(self._bounds) <= 0).any()):
+                raise ValueError('bounds must be increasing integers from 0 to k.')
+        clusters = self._bounds.size - 1
+        self._cluster_table = numpy.empty(shape=(clusters,), dtype=dtype)
+        self._cluster_counts = numpy.empty(shape=(clusters,), dtype=numpy.int64)
+        self._cluster_tie_mask = numpy.empty(shape=(clusters,), dtype=bool)
+        self._cluster_tie_counts = numpy.empty(shape=(clusters,), dtype=numpy.intp)
+        super().__init__(k, epsilon, start_value=start_value, step_size=step_size, dtype=dtype, rng=rng)
+
+    def act(self) -> int:
+        """
+        Determine which action to take.
+
+        This picks a cluster, then an arm within it. At each level, it will explore randomly at a rate of epsilon and
+        otherwise exploit the best value.
+        @return The index of the selected action to take. Guaranteed to be an int on the range [0, k).
+        """
+        if self._rng.random() < self.epsilon:
+            cluster = int(self._rng.integers(self.clusters))
+        else:
+            cluster = self._argmax(self._cluster_table, self._cluster_tie_mask, self._cluster_tie_counts)
+        start = self._bounds[cluster]
+        stop = self._bounds[cluster + 1]
+        if self._rng.random() < self.epsilon:
+            return int(self._rng.integers(start, stop))
+        size = stop - start
+        return int(start + self._argmax(self._table[start:stop], self._tie_mask[:size], self._tie_counts[:size]))
+
+    @property
+    def bounds(self) -> numpy.ndarray:
+        """
+        Return where each cluster starts and ends.
+        @return A numpy array of clusters + 1 ints. Cluster i holds the arms on the interval [bounds[i], bounds[i + 1]).
+        """
+        return self._bounds
+
+    @property
+    def cluster_table(self) -> numpy.ndarray:
+        """
+        Return the estimated value of each cluster.
+        @return A numpy array with an element for each cluster.
+        """
+        return self._cluster_table
+
+    @property
+    def clusters(self) -> int:
+        """
+        Return the number of clusters.
+        @return An int between 1 and k.
+        """
+        return self._cluster_table.size
+
+    def reset(self) -> None:
+        """
+        Return the agent to its initial state, including the cluster values.
+        """
+        super().reset()
+        self._cluster_table.fill(self._start_value)
+        self._cluster_counts.fill(0)
+
+    def update(self, action: int, reward: float) -> None:
+        """
+        Update the values of the selected arm and the cluster holding it.
+
+        @param action An index representing which action on the table was selected. It must be between [0, k).
+        @param reward The reward obtained from this action.
+        """
+        self._updateTable(action, reward)
+        cluster = int(self._bounds.searchsorted(action, side='right')) - 1
+        if self.step_size is not None:
+            self._cluster_table[cluster] += self.step_size * (reward - self._cluster_table[cluster])
+        else:
+            self._cluster_counts[cluster] += 1
+            self._cluster_table[cluster] += (reward - self._cluster_table[cluster]) / self._cluster_counts[cluster]
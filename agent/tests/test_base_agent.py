@@ -1,4 +1,6 @@
 from agent import BaseAgent
+import numpy
+from typing import Optional
 import unittest
 
 
@@ -10,8 +12,9 @@ class FakeAgent(BaseAgent):
     to allow testing of the elements of the base class that can be tested.
     """
 
-    def __init__(self, k: int, start_value: float = 0.0) -> None:
-        super().__init__(k, start_value=start_value)
+    def __init__(self, k: int, start_value: float = 0.0, step_size: Optional[float] = None,
+                 window: Optional[int] = None, dtype=numpy.float64) -> None:
+        super().__init__(k, start_value=start_value, step_size=step_size, window=window, dtype=dtype)
 
     def act(self) -> int:
         return 0
@@ -41,6 +44,72 @@ class TestBaseAgent(unittest.TestCase):
             with self.assertRaises(Exception, msg='Static bandit did not reject invalid k input.'):
                 FakeAgent(k)  # type:ignore
 
+    def test_update_options(self):
+        """
+        Verify that only valid step sizes and windows are accepted.
+        """
+        # Valid step sizes are on (0, 1] and valid windows are positive integers.
+        for step_size in (0.1, 0.5, 1.0):
+            agent = FakeAgent(k=4, step_size=step_size)
+            self.assertEqual(agent.step_size, step_size)
+        for window in (1, 10):
+            agent = FakeAgent(k=4, window=window)
+            self.assertEqual(agent.window, window)
+        for step_size in (0.0, -0.1, 1.5):
+            with self.assertRaises(ValueError, msg='BaseAgent did not reject invalid step size.'):
+                FakeAgent(k=4, step_size=step_size)
+        for window in (0, -1, 0.5):
+            with self.assertRaises(ValueError, msg='BaseAgent did not reject invalid window.'):
+                FakeAgent(k=4, window=window)  # type:ignore
+        # Both can't be used at once.
+        with self.assertRaises(ValueError, msg='BaseAgent accepted both a step size and a window.'):
+            FakeAgent(k=4, step_size=0.1, window=10)
+
+    def test_dtype(self):
+        """
+        Verify that the table uses the requested floating point type.
+        """
+        for dtype in (numpy.float32, numpy.float64):
+            agent = FakeAgent(k=4, window=3, dtype=dtype)
+            self.assertEqual(agent.dtype, dtype)
+            self.assertEqual(agent.table.dtype, dtype)
+        for dtype in (int, numpy.int32, bool, str):
+            with self.assertRaises(ValueError, msg='BaseAgent did not reject a non floating point type.'):
+                FakeAgent(k=4, dtype=dtype)
+
+    def test_dtype_accuracy(self):
+        """
+        Verify that a float32 table stays close to a float64 table.
+
+        Apply the same long sequence of rewards to both with each update method. The rounding error of float32 should
+        not accumulate, so the tables should never drift apart by more than a small bound.
+        """
+        rewards = numpy.random.normal(loc=0.0, scale=1.0, size=10000)
+        for options in ({}, {'step_size': 0.1}, {'window': 50}):
+            with self.subTest(options=options):
+                single = FakeAgent(k=1, dtype=numpy.float32, **options)
+                double = FakeAgent(k=1, dtype=numpy.float64, **options)
+                drift = 0.0
+                for reward in rewards:
+                    single._updateTable(action=0, reward=reward)
+                    double._updateTable(action=0, reward=reward)
+                    drift = max(drift, abs(float(single.table[0]) - float(double.table[0])))
+                self.assertLess(drift, 1e-5)
+
+    def test_reset(self):
+        """
+        Verify that resetting restores the starting values and forgets previous rewards.
+        """
+        agent = FakeAgent(k=3, start_value=2.0, window=2)
+        agent._updateTable(action=1, reward=10.0)
+        agent._updateTable(action=1, reward=20.0)
+        self.assertEqual(agent.table[1], 15.0)
+        agent.reset()
+        self.assertTrue((agent.table == 2.0).all(), msg='Reset did not restore the starting values.')
+        # The first reward after a reset should be the only one in the window.
+        agent._updateTable(action=1, reward=4.0)
+        self.assertEqual(agent.table[1], 4.0)
+
     def test_exploitation(self):
         """
         Test that the class picks the best action based on the table.
@@ -58,13 +127,17 @@ class TestBaseAgent(unittest.TestCase):
                          'Exploitation picked an incorrect index.')
         # Set another equal to force a tie.
         agent._table[ACTUAL_BEST + 1] = BEST_REWARD
-        # Sample several times to make sure it never picks anything else.
+        # Sample several times to make sure it never picks anything else, but does pick both.
+        picked = set()
         for _ in range(100):
             expected_best = agent.exploit()
             result = (expected_best == ACTUAL_BEST) or (
                 expected_best == ACTUAL_BEST + 1)
             self.assertTrue(
                 result, msg='Exploitation picked an incorrect index when breaking a tie.')
+            self.assertIsInstance(expected_best, int)
+            picked.add(expected_best)
+        self.assertEqual(picked, {ACTUAL_BEST, ACTUAL_BEST + 1}, msg='Exploitation did not break ties randomly.')
 
     def test_exploration(self):
         """
@@ -1,5 +1,6 @@
 from agent import EpsilonGreedy
 import numpy
+import tracemalloc
 import unittest
 
 
@@ -55,3 +56,34 @@ class TestEpsilonGreedy(unittest.TestCase):
             # Apply the reward first, then check that the table updated correctly.
             self.agent.update(action=0, reward=rewards[i])
             self.assertEqual(self.agent.table[0], expected_results[i])
+
+    def test_no_allocations(self):
+        """
+        Test that acting and updating don't create any new arrays.
+
+        Use a large table, so that any temporary array the size of the table would stand out. Every update method is
+        checked, both with every action tied and with distinct values.
+        """
+        K = 100000
+        for options in ({}, {'step_size': 0.1}, {'window': 20}):
+            for reward in (0.0, None):
+                with self.subTest(options=options, reward=reward):
+                    agent = EpsilonGreedy(k=K, epsilon=0.5, **options)
+                    rewards = [reward] * 1000 if reward is not None else numpy.random.normal(size=1000).tolist()
+                    (warm_up, steady) = (rewards[:100], rewards[100:])
+                    # Warm up first, so that anything created once and then reused is not counted.
+                    for step_reward in warm_up:
+                        agent.update(action=agent.act(), reward=step_reward)
+                    tracemalloc.start()
+                    try:
+                        (start, _) = tracemalloc.get_traced_memory()
+                        for step_reward in steady:
+                            agent.update(action=agent.act(), reward=step_reward)
+                        (end, peak) = tracemalloc.get_traced_memory()
+                    finally:
+                        tracemalloc.stop()
+                    # Nothing should be left behind, and only a few small objects, such as the action and random
+                    # numbers, should ever exist at once. A single temporary array the size of the table would be
+                    # hundreds of times larger than this.
+                    self.assertLess(end - start, 1024)
+                    self.assertLess(peak - start, 4096)
@@ -42,3 +42,42 @@ class TestGreedy(unittest.TestCase):
             # Apply the reward first, then check that the table updated correctly.
             self.agent.update(action=0, reward=rewards[i])
             self.assertEqual(self.agent.table[0], expected_results[i])
+
+    def test_update_per_action(self):
+        """
+        Test that each action keeps its own running average.
+
+        Rewards for one action should have no effect on the step size used for another.
+        """
+        for action, reward in ((0, 1.0), (1, 10.0), (0, 3.0), (1, 20.0), (2, 5.0)):
+            self.agent.update(action=action, reward=reward)
+        self.assertEqual(self.agent.table[0], 2.0)
+        self.assertEqual(self.agent.table[1], 15.0)
+        self.assertEqual(self.agent.table[2], 5.0)
+        self.assertEqual(self.agent.table[3], 0.0)
+
+    def test_update_step_size(self):
+        """
+        Test that a constant step size produces an exponential recency-weighted average.
+        """
+        agent = Greedy(k=4, start_value=0.0, step_size=0.5)
+        expected_results = (8.0, 4.0, 6.0)
+        for reward, expected in zip((16.0, 0.0, 8.0), expected_results):
+            agent.update(action=1, reward=reward)
+            self.assertEqual(agent.table[1], expected)
+
+    def test_update_window(self):
+        """
+        Test that a sliding window only averages the most recent rewards.
+
+        This runs long enough to wrap around the window several times and compares against a direct calculation.
+        """
+        WINDOW = 3
+        agent = Greedy(k=4, start_value=0.0, window=WINDOW)
+        rewards = numpy.random.uniform(low=-1.0, high=1.0, size=20)
+        for i, reward in enumerate(rewards):
+            agent.update(action=3, reward=reward)
+            expected = numpy.mean(rewards[max(0, i - WINDOW + 1):i + 1])
+            self.assertAlmostEqual(agent.table[3], expected)
+        # The other actions should be untouched.
+        self.assertTrue((agent.table[:3] == 0.0).all())
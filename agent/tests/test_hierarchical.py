@@ -0,0 +1,82 @@
+from agent import Hierarchical
+from bandit import Clustered
+import numpy
+import unittest
+
+
+class TestHierarchical(unittest.TestCase):
+    """
+    Test case to verify behavior of the agent that picks a cluster, then an arm.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create an agent to use for tests. Ten arms in three clusters gives clusters of three, three and four arms.
+        """
+        self.agent = Hierarchical(k=10, epsilon=0.0, clusters=3)
+
+    def test_clusters(self):
+        """
+        Test that arms are split into contiguous clusters and that invalid numbers of clusters are rejected.
+        """
+        numpy.testing.assert_array_equal(self.agent.bounds, [0, 3, 6, 10])
+        self.assertEqual(self.agent.clusters, 3)
+        # By default, use the square root of k.
+        self.assertEqual(Hierarchical(k=100, epsilon=0.1).clusters, 10)
+        for clusters in (0, -1, 11, 2.5):
+            with self.assertRaises(ValueError, msg='Agent did not reject an invalid number of clusters.'):
+                Hierarchical(k=10, epsilon=0.1, clusters=clusters)  # type: ignore
+
+    def test_bounds(self):
+        """
+        Test that clusters can be given by their bounds, such as those of the bandit, and that invalid bounds are
+        rejected.
+        """
+        bandit = Clustered(k=10, clusters=4)
+        agent = Hierarchical(k=10, epsilon=0.1, bounds=bandit.bounds)
+        numpy.testing.assert_array_equal(agent.bounds, bandit.bounds)
+        self.assertEqual(agent.clusters, 4)
+        agent = Hierarchical(k=10, epsilon=0.0, bounds=[0, 1, 10])
+        agent.update(action=5, reward=2.0)
+        numpy.testing.assert_array_equal(agent.cluster_table, [0.0, 2.0])
+        for bounds in ([0, 5], [1, 10], [0, 5, 5, 10], [0, 6, 4, 10], [0.0, 10.0], [10], [[0, 10]]):
+            with self.subTest(bounds=bounds):
+                with self.assertRaises(ValueError, msg='Agent did not reject invalid bounds.'):
+                    Hierarchical(k=10, epsilon=0.1, bounds=bounds)
+        with self.assertRaises(ValueError, msg='Agent did not reject both clusters and bounds.'):
+            Hierarchical(k=10, epsilon=0.1, clusters=2, bounds=[0, 5, 10])
+
+    def test_action_selection(self):
+        """
+        Test that exploiting picks the best arm within the best cluster, and that exploring stays in range.
+        """
+        self.agent._cluster_table[:] = (0.0, 1.0, 0.0)
+        # The best arm overall is in another cluster, so it should not be picked.
+        self.agent._table[:] = (5.0, 0.0, 0.0, 0.0, 2.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+        for _ in range(100):
+            self.assertEqual(self.agent.act(), 4)
+        agent = Hierarchical(k=10, epsilon=1.0, clusters=3)
+        for _ in range(100):
+            action = agent.act()
+            self.assertIsInstance(action, int)
+            self.assertGreaterEqual(action, 0)
+            self.assertLess(action, 10)
+
+    def test_update(self):
+        """
+        Test that updates average rewards for both the arm and its cluster.
+        """
+        for action, reward in ((3, 1.0), (5, 3.0), (9, 4.0), (3, 5.0)):
+            self.agent.update(action=action, reward=reward)
+        numpy.testing.assert_array_equal(self.agent.cluster_table, [0.0, 3.0, 4.0])
+        self.assertEqual(self.agent.table[3], 3.0)
+        self.assertEqual(self.agent.table[5], 3.0)
+        self.assertEqual(self.agent.table[9], 4.0)
+        # A constant step size applies to both.
+        agent = Hierarchical(k=10, epsilon=0.0, clusters=3, step_size=0.5)
+        agent.update(action=0, reward=4.0)
+        self.assertEqual(agent.table[0], 2.0)
+        self.assertEqual(agent.cluster_table[0], 2.0)
+        # Resetting clears the cluster values as well.
+        agent.reset()
+        self.assertTrue((agent.cluster_table == 0.0).all())
@@ -1,5 +1,7 @@
 import agent
 import bandit
+import experiment
+import functools
 import numpy
 import matplotlib.pyplot
 """
@@ -11,6 +13,7 @@ some statistics are calculated and plotted for consideration.
 
 The main statistic under consideration is the total reward earned by each agent. A better agent should have better
 performance in the long run. This is tracked at each time step and plotted to show how each agent performs over time.
+The cumulative regret and the rate at which each agent picks the best arm are plotted as well.
 """
 # Set the simulation parameters.
 # How many arms each bandit has
@@ -19,16 +22,14 @@ K = 10
 N = 2000
 # How many times to select an arm on the bandit.
 M = 1000
+# The seed given to every agent's trials. Using the same one for each agent means they all face the same N bandits.
+SEED = 0
 
-# Create the bandit and agents. Use several different epsilon values.
-bandits = []
-for i in range(N):
-    single_bandit = bandit.Normal(k=K)
-    bandits.append(single_bandit)
+# Describe how to create the bandit and agents. Use several different epsilon values.
 agents = [
-    agent.Greedy(k=K),
-    agent.EpsilonGreedy(k=K, epsilon=0.01),
-    agent.EpsilonGreedy(k=K, epsilon=0.1),
+    functools.partial(agent.Greedy, k=K),
+    functools.partial(agent.EpsilonGreedy, k=K, epsilon=0.01),
+    functools.partial(agent.EpsilonGreedy, k=K, epsilon=0.1),
 ]
 agent_names = [
     '0.0',
@@ -36,27 +37,18 @@ agent_names = [
     '0.1',
 ]
 
-rewards = numpy.zeros(shape=(len(agents), N, M), dtype=numpy.float)
-for i, test_agent in enumerate(agents):
-    # Iterate through each sample trial
-    for n in range(N):
-        # Reset the Q-table. Typically, this is a private property and shouldn't be modified this way, but a reset
-        # feature is not available.
-        test_agent._table = numpy.zeros_like(a=test_agent.table)
-        cumulative_mean_reward = 0.0
-        # Select actions the appropriate number of times
-        for m in range(M):
-            action = test_agent.act()
-            reward = bandits[n].select(index=action)
-            test_agent.update(action=action, reward=reward)
-            cumulative_mean_reward += (reward -
-                                       cumulative_mean_reward) / (m + 1)
-            rewards[i, n, m] = cumulative_mean_reward
+results = []
+for make_agent in agents:
+    # Each trial uses a new agent and a new bandit. The shared seed gives trial n of every agent the same bandit.
+    results.append(experiment.runTrials(make_agent=make_agent, make_bandit=functools.partial(bandit.Normal, k=K),
+                                        trials=N, steps=M, seed=SEED))
 
 # Once all trials are complete, average across the N bandits to get the average performance for each agent at each
 # iteration
-mean_rewards = numpy.mean(a=rewards, axis=1)
-for i, agent_name in enumerate(agents):
-    matplotlib.pyplot.plot(mean_rewards[i])
-matplotlib.pyplot.legend(agent_names)
+figure, axes = matplotlib.pyplot.subplots(nrows=3, sharex=True)
+for metric, axis in zip(('average_reward', 'regret', 'optimal_action'), axes):
+    for agent_results in results:
+        axis.plot(numpy.mean(a=agent_results[metric], axis=0))
+    axis.set_ylabel(metric)
+axes[0].legend(agent_names)
 matplotlib.pyplot.show()
@@ -3,5 +3,7 @@ The bandit module implements several k-armed bandit type problems.
 """
 from .base_bandit import BaseBandit
 from .normal import Normal
+from .clustered import Clustered, clusterBounds
 from .random_walk import RandomWalk
+from .replay import Replay
 from .static import Static
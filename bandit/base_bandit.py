@@ -1,4 +1,6 @@
 import abc
+import numpy
+from typing import Optional
 
 
 class BaseBandit(abc.ABC):
@@ -10,17 +12,36 @@ class BaseBandit(abc.ABC):
     APIs across all of them.
     """
 
-    def __init__(self, k: int) -> None:
+    def __init__(self, k: int, dtype=numpy.float64, rng: Optional[numpy.random.Generator] = None) -> None:
         """
         Initialize the object with a set number of arms.
 
         @param k The number of arms this bandit should have. This must be an
         integer greater than zero.
-        @exception ValueError if k is not an integer greater than zero.
+        @param dtype The floating point type used to store any per arm
+        parameters, such as numpy.float32 or numpy.float64.
+        @param rng The random number generator to use for any random values.
+        If not provided, a new one is created. Giving each bandit its own
+        generator allows bandits to be used in parallel threads.
+        @exception ValueError if k is not an integer greater than zero or if
+        dtype is not a floating point type.
         """
         if not isinstance(k, int) or k <= 0:
             raise ValueError('k must be an integer greater than 0.')
+        dtype = numpy.dtype(dtype)
+        if not numpy.issubdtype(dtype, numpy.floating):
+            raise ValueError('dtype must be a floating point type.')
         self._k = k
+        self._dtype = dtype
+        self._rng = numpy.random.default_rng() if rng is None else rng
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        """
+        Return the floating point type of the per arm parameters.
+        @return A numpy dtype.
+        """
+        return self._dtype
 
     @property
     def k(self) -> int:
@@ -30,6 +51,28 @@ class BaseBandit(abc.ABC):
         """
         return self._k
 
+    def optimalAction(self) -> int:
+        """
+        Return the arm with the highest expected reward.
+
+        Bandits that can identify their best arm should override this. Implementations are expected to keep this cheap
+        enough to call on every step, for example by caching the result rather than searching all arms each time.
+        @return An int between [0, k) identifying the best arm at the moment this is called.
+        """
+        raise NotImplementedError(
+            'Subclass does not implement optimalAction method.')
+
+    def optimalValue(self) -> float:
+        """
+        Return the expected reward of the best arm.
+
+        Bandits that can identify their best arm should override this, with the same expectations as @ref
+        optimalAction.
+        @return A float representing the expected reward of the arm returned by @ref optimalAction.
+        """
+        raise NotImplementedError(
+            'Subclass does not implement optimalValue method.')
+
     @abc.abstractmethod
     def select(self, index):
         """
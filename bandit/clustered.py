@@ -0,0 +1,95 @@
+from bandit import BaseBandit, Normal
+import numpy
+from typing import Optional
+
+
+def clusterBounds(k: int, clusters: Optional[int] = None) -> numpy.ndarray:
+    """
+    Split k arms into clusters of contiguous arms that are as close to equal
+    in size as possible.
+
+    This is the grouping used by @ref Clustered, so anything else that groups
+    arms the same way lines up with its clusters.
+    @param k The number of arms. This must be an int greater than 0.
+    @param clusters The number of clusters. This must be an int between 1 and
+    k. If not provided, the square root of k, rounded, is used.
+    @return A numpy array of clusters + 1 ints. Cluster i holds the arms on the
+    interval [bounds[i], bounds[i + 1]).
+    @exception ValueError if clusters is out of range.
+    """
+    if clusters is None:
+        clusters = max(1, int(round(numpy.sqrt(k))))
+    if not isinstance(clusters, int) or clusters <= 0 or clusters > k:
+        raise ValueError(
+            'clusters must be an integer between 1 and {0}.'.format(k))
+    return numpy.arange(clusters + 1) * k // clusters
+
+
+class Clustered(Normal):
+    """
+    A normal distribution bandit whose arms are grouped into clusters.
+
+    The arms are split into clusters of contiguous arms that are as close to
+    equal in size as possible, as given by @ref clusterBounds. Each cluster has a mean drawn from the uniform
+    range [-1, 1). Each arm's mean is its cluster's mean plus an offset drawn
+    from a normal distribution with mean 0 and a standard deviation of spread.
+    So arms in the same cluster have similar rewards. As with @ref Normal,
+    each arm's reward is drawn from a normal distribution with a standard
+    deviation of 1.
+    """
+
+    def __init__(self, k: int, clusters: Optional[int] = None, spread: float = 0.1, dtype=numpy.float64,
+                 rng: Optional[numpy.random.Generator] = None) -> None:
+        """
+        Construct the class.
+
+        @param k The number of arms this bandit should have. This must be an
+        int greater than 0.
+        @param clusters The number of clusters to group the arms into, see
+        @ref clusterBounds.
+        @param spread The standard deviation of the arm means within a
+        cluster. Must not be negative.
+        @param dtype The floating point type used to store the means and
+        standard deviations.
+        @param rng The random number generator to use. If not provided, a new
+        one is created.
+        @exception ValueError if clusters or spread are out of range.
+        """
+        # The means are built from the clusters below, so skip drawing the
+        # ones @ref Normal would.
+        BaseBandit.__init__(self, k, dtype=dtype, rng=rng)
+        self._bounds = clusterBounds(k, clusters)
+        if spread < 0.0:
+            raise ValueError('spread must not be negative.')
+        self._std = numpy.ones(shape=(k,), dtype=self.dtype)
+        self._cluster_mean = self._rng.uniform(
+            low=-1.0, high=1.0, size=(self._bounds.size - 1,)).astype(self.dtype)
+        self._mean = numpy.repeat(
+            self._cluster_mean, numpy.diff(self._bounds))
+        self._mean += self._rng.normal(loc=0.0, scale=spread, size=(k,))
+        self._optimal_action = int(numpy.argmax(self._mean))
+
+    @property
+    def bounds(self) -> numpy.ndarray:
+        """
+        Return where each cluster starts and ends.
+        @return A numpy array of clusters + 1 ints. Cluster i holds the arms
+        on the interval [bounds[i], bounds[i + 1]).
+        """
+        return self._bounds
+
+    @property
+    def cluster_means(self) -> numpy.ndarray:
+        """
+        Return the mean each cluster's arm means were drawn around.
+        @return A numpy array with an element for each cluster.
+        """
+        return self._cluster_mean
+
+    @property
+    def clusters(self) -> int:
+        """
+        Return the number of clusters.
+        @return An int between 1 and k.
+        """
+        return self._cluster_mean.size
@@ -1,5 +1,6 @@
 from bandit import BaseBandit
 import numpy
+from typing import Optional
 
 
 class Normal(BaseBandit):
@@ -10,7 +11,7 @@ class Normal(BaseBandit):
     randomly drawn from the uniform range [-1, 1).
     """
 
-    def __init__(self, k: int) -> None:
+    def __init__(self, k: int, dtype=numpy.float64, rng: Optional[numpy.random.Generator] = None) -> None:
         """
         Construct the class.
 
@@ -20,12 +21,35 @@ class Normal(BaseBandit):
         1.0.
         @param k The number of arms this bandit should have. This must be an
         int greater than 0.
+        @param dtype The floating point type used to store the means and
+        standard deviations.
+        @param rng The random number generator to use. If not provided, a new
+        one is created.
         """
-        super().__init__(k)
+        super().__init__(k, dtype=dtype, rng=rng)
         # The standard deviations are fixed.
-        self._std = numpy.ones(shape=(k,), dtype=numpy.float)
+        self._std = numpy.ones(shape=(k,), dtype=self.dtype)
         # The means are drawn from a uniform range.
-        self._mean = numpy.random.uniform(low=-1.0, high=1.0, size=(k,))
+        self._mean = self._rng.uniform(
+            low=-1.0, high=1.0, size=(k,)).astype(self.dtype)
+        # The means never change, so the best arm only needs to be found once.
+        self._optimal_action = int(numpy.argmax(self._mean))
+
+    def optimalAction(self) -> int:
+        """
+        Return the arm with the highest mean.
+
+        @return An int between [0, k) identifying the arm with the highest mean.
+        """
+        return self._optimal_action
+
+    def optimalValue(self) -> float:
+        """
+        Return the highest mean of all the arms.
+
+        @return A float that is the mean of the arm returned by @ref optimalAction.
+        """
+        return float(self._mean[self._optimal_action])
 
     def select(self, index):
         """
@@ -43,7 +67,7 @@ class Normal(BaseBandit):
             return None
         means = self._mean[index]
         stds = self._std[index]
-        return numpy.random.normal(loc=means, scale=stds)
+        return self._rng.normal(loc=means, scale=stds)
 
     def trueValues(self):
         """
@@ -1,5 +1,6 @@
 import numpy
 from bandit import Normal
+from typing import Optional
 
 
 class RandomWalk(Normal):
@@ -14,12 +15,22 @@ class RandomWalk(Normal):
     values are drawn independently for each arm.
     """
 
-    def __init__(self, k: int) -> None:
-        super().__init__(k)
+    def __init__(self, k: int, dtype=numpy.float64, rng: Optional[numpy.random.Generator] = None) -> None:
+        super().__init__(k, dtype=dtype, rng=rng)
+        # Reuse the same array for the walk on every step rather than
+        # creating a new one.
+        self._walk_values = numpy.empty(shape=(k,), dtype=self.dtype)
 
     def select(self, index):
         rewards = super().select(index)
         # Now modify the means.
-        walk_values = numpy.random.normal(loc=0.0, scale=0.01, size=self.k)
+        walk_values = self._walk_values
+        self._rng.standard_normal(out=walk_values, dtype=self.dtype)
+        walk_values *= 0.01
         self._mean += walk_values
+        # Every arm moves on every step, so the best arm may have changed.
+        # Walking the means already takes a pass over every arm, and a single
+        # argmax is one more pass that creates no new arrays, so just search
+        # again.
+        self._optimal_action = int(self._mean.argmax())
         return rewards
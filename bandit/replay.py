@@ -0,0 +1,342 @@
+from bandit import BaseBandit
+import bisect
+import concurrent.futures
+import numpy
+import os
+from typing import Optional
+
+
+class Replay(BaseBandit):
+    """
+    A bandit that serves rewards from a log of previously recorded selections.
+
+    This allows agents to be evaluated offline against real data rather than
+    a simulated distribution. Each entry in the log is the arm that was
+    selected and the reward that was received. Two evaluation methods are
+    available.
+
+    - replay: Entries are used in order. When an arm is selected, entries for
+    other arms are skipped until one for the selected arm is found, and its
+    reward is returned. This is unbiased when the log was recorded by
+    selecting arms uniformly at random.
+    - ips: Inverse propensity scoring. Each selection uses exactly one entry.
+    If the selected arm matches the logged arm, the reward divided by the
+    probability the logging policy had of selecting that arm is returned.
+    Otherwise, the reward is 0. This requires the propensity of each entry.
+
+    The log is never loaded into memory all at once. It is read in chunks, and
+    the next chunk is read in the background while the current one is used.
+    Passing a path to a .npy file opens it as a memory map, so logs much larger
+    than the available memory can be used. The background reader stops once
+    the last chunk has been read, or when the bandit is closed, either with
+    @ref close or by using it as a context manager.
+
+    By default, every new bandit serves the log from its beginning. When
+    running many trials, give each one its own part of the log with start and
+    stop so that they do not all replay the same entries. Finding the true
+    values takes a pass over the log, so find them once, for example from a
+    bandit over the whole log, and pass them to every other bandit with
+    true_values.
+    """
+
+    ## The available evaluation methods.
+    METHODS = ('replay', 'ips')
+
+    def __init__(self, k: int, arms, rewards, propensities=None, method: str = 'replay',
+                 chunk_size: int = 65536, start: int = 0, stop: Optional[int] = None,
+                 true_values=None, dtype=numpy.float64, rng: Optional[numpy.random.Generator] = None) -> None:
+        """
+        Open the log.
+
+        @param k The number of arms this bandit has. This must be an int
+        greater than 0. Every logged arm must be on the interval [0, k).
+        @param arms The logged arm of each entry. This can be a path to a .npy
+        file or a one dimensional array of ints.
+        @param rewards The logged reward of each entry. This can be a path to a
+        .npy file or a one dimensional array of floats with the same length as
+        arms.
+        @param propensities The probability the logging policy had of selecting
+        the logged arm for each entry. This is the same format as rewards and
+        is required by the ips method.
+        @param method Either 'replay' or 'ips', see @ref Replay.
+        @param chunk_size The number of entries to read at a time. Must be an
+        int greater than 0.
+        @param start The index of the first log entry to use. Must be an int on
+        the interval [0, stop].
+        @param stop One past the index of the last log entry to use. Must be an
+        int no greater than the length of the log. Defaults to the end of the
+        log.
+        @param true_values The mean reward of each arm, as returned by
+        @ref trueValues, if it is already known. This must have a length of k.
+        If it is not given, it is computed from the entries between start and
+        stop when first needed.
+        @param dtype The floating point type that logged rewards, propensities
+        and true values are converted to when they are read.
+        @param rng The random number generator to use. Rewards come from the
+        log, so this is not used, but it is accepted so that replay bandits can
+        be created in the same way as any other bandit.
+        @exception ValueError if any of the inputs are invalid.
+        """
+        super().__init__(k, dtype=dtype, rng=rng)
+        if method not in self.METHODS:
+            raise ValueError('method must be one of {0}, not {1}'.format(
+                self.METHODS, method))
+        if method == 'ips' and propensities is None:
+            raise ValueError('The ips method requires propensities.')
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError('chunk_size must be an integer greater than 0.')
+        self._method = method
+        self._chunk_size = chunk_size
+        self._arms = self._open(arms)
+        self._rewards = self._open(rewards)
+        self._propensities = None if propensities is None else self._open(
+            propensities)
+        for column in (self._rewards, self._propensities):
+            if column is not None and column.shape != self._arms.shape:
+                raise ValueError('Every logged column must have a length of {0}, not {1}'.format(
+                    self._arms.size, column.size))
+        if stop is None:
+            stop = self._arms.size
+        if not isinstance(stop, int) or stop > self._arms.size:
+            raise ValueError('stop must be an integer no greater than {0}.'.format(self._arms.size))
+        if not isinstance(start, int) or start < 0 or start > stop:
+            raise ValueError('start must be an integer on the interval [0, {0}].'.format(stop))
+        self._start = start
+        self._stop = stop
+        # The index of the next entry in the log that has not been used.
+        self._cursor = start
+        self._true_values = None
+        if true_values is not None:
+            true_values = numpy.array(true_values, dtype=self.dtype)
+            if true_values.shape != (k,):
+                raise ValueError('true_values must have a length of {0}.'.format(k))
+            self._true_values = true_values
+            self._optimal_action = int(numpy.nanargmax(self._true_values))
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        self._next_chunk = None
+        self._chunk_start = 0
+        self._chunk_stop = 0
+        if self._cursor < self._stop:
+            self._advance()
+        else:
+            self.close()
+
+    @property
+    def remaining(self) -> int:
+        """
+        Return the number of log entries that have not been used yet.
+        @return An int greater than or equal to zero.
+        """
+        return self._stop - self._cursor
+
+    def __enter__(self) -> 'Replay':
+        """
+        Use the bandit as a context manager, closing it on exit.
+        """
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Close the bandit, see @ref close.
+        """
+        self.close()
+
+    def select(self, index):
+        """
+        Select an arm and obtain a reward from the log.
+
+        @param index A single int for the arm to select. None can also be
+        passed, but will only return a reward of None.
+        @return The reward as a float, according to the evaluation method. If
+        None is passed in, this will also be None.
+        @exception EOFError if the log runs out before a reward can be found.
+        """
+        if index is None:
+            return None
+        if not isinstance(index, (int, numpy.integer)) or isinstance(index, bool):
+            raise TypeError('Replay bandits can only select a single integer arm.')
+        if index < -self.k or index >= self.k:
+            raise IndexError('Arm {0} is out of range for {1} arms.'.format(
+                index, self.k))
+        if index < 0:
+            index += self.k
+        index = int(index)
+        if self._method == 'replay':
+            return self._selectReplay(index)
+        return self._selectIps(index)
+
+    def trueValues(self):
+        """
+        Return the mean logged reward of each arm.
+
+        Unless they were given when the bandit was created, these are computed
+        from the entries between start and stop the first time this is called,
+        one chunk at a time.
+        @return A numpy array where each index holds the mean logged reward
+        of that arm. Arms that never appear in the log have a value of nan.
+        """
+        if self._true_values is None:
+            sums = numpy.zeros(shape=(self.k,), dtype=numpy.float64)
+            counts = numpy.zeros(shape=(self.k,), dtype=numpy.int64)
+            for start in range(self._start, self._stop, self._chunk_size):
+                stop = min(start + self._chunk_size, self._stop)
+                arms = numpy.asarray(self._arms[start:stop], dtype=numpy.int64)
+                rewards = numpy.asarray(
+                    self._rewards[start:stop], dtype=self.dtype)
+                sums += numpy.bincount(arms, weights=rewards,
+                                       minlength=self.k)
+                counts += numpy.bincount(arms, minlength=self.k)
+            # The sums are kept in double precision so that long logs do not
+            # lose accuracy, and only the means use the bandit's type.
+            with numpy.errstate(invalid='ignore', divide='ignore'):
+                self._true_values = (sums / counts).astype(self.dtype)
+            self._optimal_action = int(numpy.nanargmax(self._true_values))
+        return self._true_values
+
+    def optimalAction(self) -> int:
+        """
+        Return the arm with the highest mean logged reward.
+        @return An int between [0, k).
+        """
+        self.trueValues()
+        return self._optimal_action
+
+    def optimalValue(self) -> float:
+        """
+        Return the highest mean logged reward of all the arms.
+        @return A float that is the mean logged reward of the arm returned by
+        @ref optimalAction.
+        """
+        return float(self.trueValues()[self._optimal_action])
+
+    def close(self) -> None:
+        """
+        Stop reading the log in the background.
+
+        The bandit can still be used afterwards, but chunks will be read only
+        when they are needed.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _advance(self) -> None:
+        """
+        Move on to the chunk containing the cursor.
+
+        @exception EOFError if the cursor is past the end of the log.
+        """
+        if self._cursor >= self._stop:
+            raise EOFError('The log has no more entries.')
+        if self._next_chunk is not None and self._next_chunk_start == self._cursor:
+            chunk = self._next_chunk.result()
+        else:
+            chunk = self._readChunk(self._cursor)
+        (self._chunk_start, self._chunk_stop, self._chunk_arms, self._chunk_rewards, self._chunk_propensities,
+         self._chunk_order, self._chunk_offsets) = chunk
+        self._prefetch()
+
+    def _open(self, column) -> numpy.ndarray:
+        """
+        Open a logged column without reading all of it into memory.
+
+        @param column A path to a .npy file, or anything numpy can convert to
+        an array.
+        @return A one dimensional numpy array or memory map.
+        """
+        if isinstance(column, (str, os.PathLike)):
+            column = numpy.load(column, mmap_mode='r')
+        else:
+            column = numpy.asarray(column)
+        if column.ndim != 1:
+            raise ValueError('Logged columns must be one dimensional.')
+        return column
+
+    def _prefetch(self) -> None:
+        """
+        Start reading the chunk after the current one in the background.
+        """
+        self._next_chunk_start = self._chunk_stop
+        if self._next_chunk_start >= self._stop:
+            # Every chunk has been read, so the background reader is no longer
+            # needed.
+            self._next_chunk = None
+            self.close()
+        elif self._executor is None:
+            self._next_chunk = None
+        else:
+            self._next_chunk = self._executor.submit(
+                self._readChunk, self._next_chunk_start)
+
+    def _readChunk(self, start: int):
+        """
+        Copy a chunk of the log into memory.
+
+        The chunk is converted to lists, since single elements of a list are
+        much faster to access than those of a numpy array. For the replay
+        method, this also sorts the chunk's entries by arm, so that the next
+        entry for any arm can be found with a binary search rather than a scan.
+        @param start The index of the first log entry in the chunk.
+        @return A tuple of the start index, the stop index, the arms, the
+        rewards, the propensities (or None), the entry positions sorted by arm
+        (or None), and where each arm's positions begin in that sorted list
+        (or None).
+        @exception ValueError if any logged arm is out of range.
+        """
+        stop = min(start + self._chunk_size, self._stop)
+        arms = numpy.array(self._arms[start:stop], dtype=numpy.int64)
+        if arms.size > 0 and (arms.min() < 0 or arms.max() >= self.k):
+            raise ValueError(
+                'Logged arms must be on the interval [0, {0}).'.format(self.k))
+        rewards = numpy.asarray(
+            self._rewards[start:stop], dtype=self.dtype).tolist()
+        propensities = None
+        if self._propensities is not None:
+            propensities = numpy.asarray(
+                self._propensities[start:stop], dtype=self.dtype).tolist()
+        order = None
+        offsets = None
+        if self._method == 'replay':
+            # A stable sort keeps each arm's positions in increasing order.
+            order = numpy.argsort(arms, kind='stable').tolist()
+            offsets = numpy.zeros(shape=(self.k + 1,), dtype=numpy.int64)
+            numpy.cumsum(numpy.bincount(arms, minlength=self.k),
+                         out=offsets[1:])
+            offsets = offsets.tolist()
+        return (start, stop, arms.tolist(), rewards, propensities, order, offsets)
+
+    def _selectIps(self, index: int) -> float:
+        """
+        Use the next log entry to score the selected arm.
+
+        @param index The selected arm, on the interval [0, k).
+        @return The inverse propensity scored reward.
+        """
+        if self._cursor >= self._chunk_stop:
+            self._advance()
+        position = self._cursor - self._chunk_start
+        self._cursor += 1
+        if self._chunk_arms[position] != index:
+            return 0.0
+        return self._chunk_rewards[position] / self._chunk_propensities[position]
+
+    def _selectReplay(self, index: int) -> float:
+        """
+        Skip ahead to the next log entry for the selected arm.
+
+        @param index The selected arm, on the interval [0, k).
+        @return The logged reward of that entry.
+        """
+        while True:
+            if self._cursor >= self._chunk_stop:
+                self._advance()
+            end = self._chunk_offsets[index + 1]
+            i = bisect.bisect_left(self._chunk_order, self._cursor - self._chunk_start,
+                                   lo=self._chunk_offsets[index], hi=end)
+            if i < end:
+                position = self._chunk_order[i]
+                self._cursor = self._chunk_start + position + 1
+                return self._chunk_rewards[position]
+            # There are no more entries for this arm in the chunk, so skip the
+            # rest of it.
+            self._cursor = self._chunk_stop
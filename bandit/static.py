@@ -11,7 +11,7 @@ class Static(BaseBandit):
     The user can specify the reward values at instantiation if they want.
     """
 
-    def __init__(self, k, rewards=None):
+    def __init__(self, k, rewards=None, dtype=numpy.float64, rng=None):
         """
         Instantiate the class.
 
@@ -24,15 +24,35 @@ class Static(BaseBandit):
         be a list, array, numpy array, or any sort of iterable object, but must
         have a length equal to k. It can also be None to let the bandit pick
         random rewards from the interval [0, 1).
+        @param dtype The floating point type used to store the rewards.
+        @param rng The random number generator used to pick the rewards if
+        they are not provided. If not provided, a new one is created.
         """
-        super().__init__(k)
+        super().__init__(k, dtype=dtype, rng=rng)
         if rewards is None:
-            self._rewards = numpy.random.uniform(low=0, high=1, size=self.k)
+            self._rewards = self._rng.uniform(
+                low=0, high=1, size=self.k).astype(self.dtype)
         else:
             if len(rewards) != self.k:
                 raise ValueError('rewards_value must have a length of {0}, not {1}'.format(
                     self.k, len(rewards)))
-            self._rewards = numpy.fromiter(rewards, dtype=numpy.float)
+            self._rewards = numpy.fromiter(rewards, dtype=self.dtype)
+        # The rewards never change, so the best arm only needs to be found once.
+        self._optimal_action = int(numpy.argmax(self._rewards))
+
+    def optimalAction(self) -> int:
+        """
+        Return the arm with the highest reward.
+        @return An int between [0, k) identifying the arm with the highest reward.
+        """
+        return self._optimal_action
+
+    def optimalValue(self) -> float:
+        """
+        Return the highest reward of all the arms.
+        @return A float that is the reward of the arm returned by @ref optimalAction.
+        """
+        return float(self._rewards[self._optimal_action])
 
     @property
     def rewards(self):
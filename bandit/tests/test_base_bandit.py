@@ -1,4 +1,5 @@
 from bandit import BaseBandit
+import numpy
 import unittest
 
 
@@ -12,8 +13,8 @@ class FakeBandit(BaseBandit):
     instead.
     """
 
-    def __init__(self, k):
-        super().__init__(k)
+    def __init__(self, k, dtype=numpy.float64):
+        super().__init__(k, dtype=dtype)
 
     def select(self, index):
         pass
@@ -45,3 +46,15 @@ class TestBaseBandit(unittest.TestCase):
         for k in (0, -1, 0.5, '1', 'the', None):
             with self.assertRaises(ValueError, msg='Static bandit did not reject invalid k input.'):
                 FakeBandit(k)
+
+    def test_instantiate_dtype(self):
+        """
+        Test that only floating point types are accepted for the per arm
+        parameters.
+        """
+        for dtype in (numpy.float32, numpy.float64, 'float32'):
+            bandit = FakeBandit(3, dtype=dtype)
+            self.assertEqual(bandit.dtype, numpy.dtype(dtype))
+        for dtype in (int, numpy.int64, bool, str):
+            with self.assertRaises(ValueError, msg='Bandit did not reject a non floating point type.'):
+                FakeBandit(3, dtype=dtype)
@@ -0,0 +1,49 @@
+from bandit import Clustered, clusterBounds
+import numpy
+import unittest
+
+
+class TestClusteredBandit(unittest.TestCase):
+    """
+    Tests the bandit with arms grouped into clusters.
+    """
+
+    def test_clusters(self):
+        """
+        Test that arms are split into contiguous clusters with means close to
+        their cluster's mean.
+        """
+        bandit = Clustered(k=10, clusters=3, spread=0.0)
+        numpy.testing.assert_array_equal(bandit.bounds, [0, 3, 6, 10])
+        self.assertEqual(bandit.clusters, 3)
+        # The true values are the same as those of any normal bandit.
+        (mean, std) = bandit.trueValues()
+        # With no spread, every arm has exactly its cluster's mean.
+        numpy.testing.assert_array_equal(
+            mean, numpy.repeat(bandit.cluster_means, (3, 3, 4)))
+        self.assertTrue((std == 1.0).all())
+        self.assertEqual(bandit.optimalValue(), numpy.max(mean))
+        # By default, use the square root of k.
+        self.assertEqual(Clustered(k=100).clusters, 10)
+        numpy.testing.assert_array_equal(clusterBounds(100), numpy.arange(0, 101, 10))
+
+    def test_dtype(self):
+        """
+        Test that the means are built with the requested type.
+        """
+        for dtype in (numpy.float32, numpy.float64):
+            bandit = Clustered(k=10, dtype=dtype)
+            (mean, std) = bandit.trueValues()
+            self.assertEqual(mean.dtype, dtype)
+            self.assertEqual(std.dtype, dtype)
+            self.assertEqual(bandit.cluster_means.dtype, dtype)
+
+    def test_invalid_inputs(self):
+        """
+        Test that invalid numbers of clusters and spreads are rejected.
+        """
+        for clusters in (0, -1, 11, 2.5):
+            with self.assertRaises(ValueError, msg='Invalid clusters not rejected.'):
+                Clustered(k=10, clusters=clusters)
+        with self.assertRaises(ValueError, msg='Invalid spread not rejected.'):
+            Clustered(k=10, spread=-0.1)
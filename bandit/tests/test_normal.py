@@ -1,4 +1,5 @@
 from bandit import Normal
+import numpy
 import unittest
 
 
@@ -52,3 +53,22 @@ class TestNormalBandit(unittest.TestCase):
             with self.subTest(i=i):
                 with self.assertRaises(Exception, msg='Incorrect indices not rejected.'):
                     reward = bandit.select(i)
+
+    def test_optimal(self):
+        """
+        Test that the best arm is the one with the highest mean.
+        """
+        bandit = Normal(k=10)
+        (mean, _) = bandit.trueValues()
+        self.assertEqual(bandit.optimalAction(), numpy.argmax(mean))
+        self.assertEqual(bandit.optimalValue(), numpy.max(mean))
+
+    def test_dtype(self):
+        """
+        Test that the distribution parameters use the requested type.
+        """
+        for dtype in (numpy.float32, numpy.float64):
+            bandit = Normal(k=10, dtype=dtype)
+            (mean, std) = bandit.trueValues()
+            self.assertEqual(mean.dtype, dtype)
+            self.assertEqual(std.dtype, dtype)
@@ -1,5 +1,6 @@
 from bandit import RandomWalk
 import numpy
+import tracemalloc
 import unittest
 
 
@@ -33,3 +34,40 @@ class TestRandomWalkBandit(unittest.TestCase):
             values_have_changed |= not numpy.array_equal(previous_mean, mean)
             previous_mean = numpy.copy(mean)
         self.assertTrue(values_have_changed)
+
+    def test_optimal(self):
+        """
+        Test that the best arm is kept up to date as the means walk.
+
+        Use close starting means so that the best arm changes often.
+        """
+        bandit = RandomWalk(10)
+        bandit._mean[:] = numpy.linspace(0.0, 0.01, 10)
+        bandit._optimal_action = 9
+        for _ in range(1000):
+            (mean, _) = bandit.trueValues()
+            self.assertEqual(bandit.optimalAction(), numpy.argmax(mean))
+            self.assertEqual(bandit.optimalValue(), numpy.max(mean))
+            bandit.select(0)
+
+    def test_select_cost(self):
+        """
+        Test that walking the means and finding the best arm do not copy them.
+
+        Use many arms, so that any temporary array the size of the means would
+        stand out against the few small objects each step needs.
+        """
+        K = 100000
+        bandit = RandomWalk(K)
+        bandit.select(0)
+        tracemalloc.start()
+        try:
+            (start, _) = tracemalloc.get_traced_memory()
+            for _ in range(100):
+                bandit.select(0)
+                bandit.optimalAction()
+            (end, peak) = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(end - start, 1024)
+        self.assertLess(peak - start, 4096)
@@ -0,0 +1,168 @@
+from bandit import Replay
+import numpy
+import os
+import tempfile
+import unittest
+
+
+class TestReplayBandit(unittest.TestCase):
+    """
+    Test the bandit that serves rewards from a log.
+    """
+
+    def setUp(self) -> None:
+        """
+        Create a small log to use in tests.
+
+        The reward of each entry is its position, so it is easy to see which entry was used.
+        """
+        self.arms = numpy.array([0, 1, 2, 0, 2, 2, 1, 0, 1, 2])
+        self.rewards = numpy.arange(self.arms.size, dtype=numpy.float64)
+        self.propensities = numpy.full(shape=self.arms.shape, fill_value=0.5)
+
+    def test_replay(self):
+        """
+        Test that selecting an arm skips to the next entry for that arm.
+
+        Use small chunks to be sure this works across chunk boundaries.
+        """
+        for chunk_size in (1, 3, 100):
+            with self.subTest(chunk_size=chunk_size):
+                bandit = Replay(3, self.arms, self.rewards, chunk_size=chunk_size)
+                self.assertEqual(bandit.select(1), 1.0)
+                self.assertEqual(bandit.select(0), 3.0)
+                self.assertEqual(bandit.select(-1), 4.0)
+                self.assertEqual(bandit.select(1), 6.0)
+                self.assertEqual(bandit.remaining, 3)
+                self.assertEqual(bandit.select(2), 9.0)
+                self.assertEqual(bandit.remaining, 0)
+                # There is nothing left to serve.
+                with self.assertRaises(EOFError):
+                    bandit.select(0)
+                bandit.close()
+
+    def test_ips(self):
+        """
+        Test that each selection uses one entry, scaled by its propensity when the arm matches.
+        """
+        bandit = Replay(3, self.arms, self.rewards, propensities=self.propensities, method='ips', chunk_size=4)
+        expected_rewards = [0.0, 2.0, 0.0, 6.0, 8.0, 0.0]
+        for arm, expected in zip((0, 1, 1, 0, 2, 0), expected_rewards):
+            self.assertEqual(bandit.select(arm), expected)
+
+    def test_memory_map(self):
+        """
+        Test that logs can be read from files.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            arms_path = os.path.join(directory, 'arms.npy')
+            rewards_path = os.path.join(directory, 'rewards.npy')
+            numpy.save(arms_path, self.arms)
+            numpy.save(rewards_path, self.rewards)
+            bandit = Replay(3, arms_path, rewards_path, chunk_size=2)
+            self.assertEqual(bandit.select(2), 2.0)
+            self.assertEqual(bandit.select(2), 4.0)
+            bandit.close()
+            del bandit
+
+    def test_true_values(self):
+        """
+        Test that the true values are the mean logged reward of each arm.
+        """
+        # Raise the last reward so that arm 2 is clearly the best.
+        self.rewards[-1] = 13.0
+        bandit = Replay(4, self.arms, self.rewards, chunk_size=3)
+        values = bandit.trueValues()
+        numpy.testing.assert_allclose(values[:3], [10.0 / 3.0, 5.0, 6.0])
+        self.assertTrue(numpy.isnan(values[3]))
+        self.assertEqual(bandit.optimalAction(), 2)
+        self.assertEqual(bandit.optimalValue(), 6.0)
+
+    def test_shards(self):
+        """
+        Test that start and stop limit the bandit to part of the log.
+        """
+        for chunk_size in (1, 3, 100):
+            with self.subTest(chunk_size=chunk_size):
+                with Replay(3, self.arms, self.rewards, chunk_size=chunk_size, start=4, stop=8) as bandit:
+                    self.assertEqual(bandit.remaining, 4)
+                    self.assertEqual(bandit.select(0), 7.0)
+                    self.assertEqual(bandit.remaining, 0)
+                    with self.assertRaises(EOFError):
+                        bandit.select(1)
+                # The true values only come from the entries in the shard.
+                bandit = Replay(3, self.arms, self.rewards, chunk_size=chunk_size, start=4, stop=8)
+                numpy.testing.assert_allclose(bandit.trueValues(), [7.0, 6.0, 4.5])
+                bandit.close()
+
+    def test_shared_true_values(self):
+        """
+        Test that true values that are already known are used rather than computed from the log.
+        """
+        with Replay(3, self.arms, self.rewards, chunk_size=3) as bandit:
+            values = bandit.trueValues()
+        with Replay(3, self.arms, self.rewards, chunk_size=3, start=5, true_values=values) as bandit:
+            numpy.testing.assert_array_equal(bandit.trueValues(), values)
+            self.assertEqual(bandit.optimalAction(), 1)
+        # Values that do not match the log show that the log is not read.
+        with Replay(3, self.arms, self.rewards, true_values=[3.0, 1.0, 2.0]) as bandit:
+            self.assertEqual(bandit.optimalAction(), 0)
+            self.assertEqual(bandit.optimalValue(), 3.0)
+
+    def test_background_reader(self):
+        """
+        Test that the background reader stops at the end of the log and when the bandit is closed.
+        """
+        with Replay(3, self.arms, self.rewards, chunk_size=4) as bandit:
+            self.assertIsNotNone(bandit._executor)
+        self.assertIsNone(bandit._executor)
+        bandit = Replay(3, self.arms, self.rewards, chunk_size=4)
+        self.assertEqual(bandit.select(1), 1.0)
+        self.assertEqual(bandit.select(1), 6.0)
+        self.assertIsNotNone(bandit._executor)
+        # Reaching the last chunk leaves nothing more to read.
+        self.assertEqual(bandit.select(1), 8.0)
+        self.assertIsNone(bandit._executor)
+        self.assertEqual(bandit.select(2), 9.0)
+
+    def test_dtype(self):
+        """
+        Test that rewards and true values are read with the requested type, whether computed or provided.
+        """
+        # 0.1 can not be stored exactly, and rounds differently for each type.
+        rewards = numpy.full(shape=self.arms.shape, fill_value=0.1)
+        for dtype in (numpy.float32, numpy.float64):
+            with self.subTest(dtype=dtype):
+                with Replay(3, self.arms, rewards, dtype=dtype) as bandit:
+                    self.assertEqual(bandit.dtype, dtype)
+                    self.assertEqual(bandit.select(0), float(dtype(0.1)))
+                    self.assertEqual(bandit.trueValues().dtype, dtype)
+                with Replay(3, self.arms, rewards, true_values=[0.1, 0.2, 0.3], dtype=dtype) as bandit:
+                    self.assertEqual(bandit.trueValues().dtype, dtype)
+
+    def test_invalid_inputs(self):
+        """
+        Test that invalid logs, options and selections are rejected.
+        """
+        with self.assertRaises(ValueError, msg='Mismatched columns not rejected.'):
+            Replay(3, self.arms, self.rewards[:5])
+        with self.assertRaises(ValueError, msg='Out of range arms not rejected.'):
+            Replay(2, self.arms, self.rewards)
+        with self.assertRaises(ValueError, msg='Unknown method not rejected.'):
+            Replay(3, self.arms, self.rewards, method='other')
+        with self.assertRaises(ValueError, msg='Missing propensities not rejected.'):
+            Replay(3, self.arms, self.rewards, method='ips')
+        for start, stop in ((-1, None), (5, 4), (0, 11), (0.5, None)):
+            with self.subTest(start=start, stop=stop):
+                with self.assertRaises(ValueError, msg='Invalid shard not rejected.'):
+                    Replay(3, self.arms, self.rewards, start=start, stop=stop)
+        with self.assertRaises(ValueError, msg='Wrong number of true values not rejected.'):
+            Replay(3, self.arms, self.rewards, true_values=[1.0, 2.0])
+        with self.assertRaises(ValueError, msg='Integer dtype not rejected.'):
+            Replay(3, self.arms, self.rewards, dtype=numpy.int64)
+        bandit = Replay(3, self.arms, self.rewards)
+        self.assertIsNone(bandit.select(None))
+        for i in (0.5, 3, -4, '1', [0, 1]):
+            with self.subTest(i=i):
+                with self.assertRaises(Exception, msg='Incorrect indices not rejected.'):
+                    bandit.select(i)
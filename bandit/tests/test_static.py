@@ -73,6 +73,23 @@ class TestStaticBandit(unittest.TestCase):
         # None is a special case and will return None
         self.assertIsNone(bandit.select(None))
 
+    def test_optimal(self):
+        """
+        Test that the best arm and its reward are reported correctly.
+        """
+        bandit = Static(k=4, rewards=(0.25, 0.75, 0.5, 0.0))
+        self.assertEqual(bandit.optimalAction(), 1)
+        self.assertEqual(bandit.optimalValue(), 0.75)
+
+    def test_dtype(self):
+        """
+        Test that the rewards use the requested type, whether provided or
+        randomly selected.
+        """
+        for rewards in (None, (0.25, 0.5, 0.75)):
+            bandit = Static(3, rewards, dtype=numpy.float32)
+            self.assertEqual(bandit.trueValues().dtype, numpy.float32)
+
 
 if __name__ == '__main__':
     unittest.main()
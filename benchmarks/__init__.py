@@ -0,0 +1,5 @@
+"""
+The benchmarks module holds scripts that measure the speed and memory use of the agents, bandits and experiments.
+
+Run each from the root of the repository, for example: python -m benchmarks.dtype
+"""
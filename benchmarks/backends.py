@@ -0,0 +1,30 @@
+"""
+Compare the serial, thread and process backends of the experiment runner.
+
+Each backend runs the same trials for a bandit with few arms and for one with many arms. With few arms, each step is
+mostly Python, which holds the GIL, so threads can't do much better than running serially. With many arms, most of
+each step is spent inside numpy, which releases the GIL, so threads can run in parallel without the cost of starting
+processes and copying results back from them.
+"""
+import agent
+import bandit
+import experiment
+import functools
+import os
+import time
+
+# How many trials and steps to run for each setting.
+TRIALS = 32
+STEPS = 200
+# How many threads or processes to use.
+WORKERS = os.cpu_count() or 1
+
+print('{0} workers'.format(WORKERS))
+print('{0:>10} {1:>10} {2:>10}'.format('arms', 'backend', 'seconds'))
+for k in (10, 10000):
+    make_agent = functools.partial(agent.EpsilonGreedy, k=k, epsilon=0.1)
+    make_bandit = functools.partial(bandit.RandomWalk, k=k)
+    for backend in experiment.BACKENDS:
+        start = time.perf_counter()
+        experiment.runTrials(make_agent, make_bandit, trials=TRIALS, steps=STEPS, backend=backend, workers=WORKERS)
+        print('{0:>10} {1:>10} {2:>10.3f}'.format(k, backend, time.perf_counter() - start))
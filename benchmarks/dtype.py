@@ -0,0 +1,33 @@
+"""
+Compare the memory use and speed of float32 and float64 storage.
+
+Each dtype is used for the result arrays of a large batch of trials, then for the per step work of a bandit and an agent
+with many arms. At large sizes these are limited by how fast memory can be read and written, so halving the size of
+each value should show up in the timings as well as the memory use.
+"""
+import agent
+import bandit
+import experiment
+import numpy
+import timeit
+
+# How many trials and steps to size the result arrays for.
+TRIALS = 10000
+STEPS = 1000
+# How many arms the bandit and agent have.
+K = 1000000
+# How many times to repeat each timed step.
+REPEATS = 200
+
+print('{0:>8} {1:>12} {2:>18} {3:>18}'.format('dtype', 'results MB', 'random walk ms', 'exploit ms'))
+for dtype in (numpy.float64, numpy.float32):
+    results = experiment.allocateResults(trials=TRIALS, steps=STEPS, dtype=dtype)
+    megabytes = sum(values.nbytes for values in results.values()) / 1e6
+    del results
+    test_bandit = bandit.RandomWalk(k=K, dtype=dtype)
+    test_agent = agent.EpsilonGreedy(k=K, epsilon=0.1, dtype=dtype)
+    test_agent.table[:] = numpy.random.normal(size=K)
+    walk_time = timeit.timeit(lambda: test_bandit.select(0), number=REPEATS) / REPEATS
+    exploit_time = timeit.timeit(test_agent.exploit, number=REPEATS) / REPEATS
+    print('{0:>8} {1:>12.1f} {2:>18.3f} {3:>18.3f}'.format(
+        numpy.dtype(dtype).name, megabytes, 1000 * walk_time, 1000 * exploit_time))
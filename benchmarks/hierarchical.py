@@ -0,0 +1,60 @@
+"""
+Compare a hierarchical agent against a flat epsilon greedy agent on a bandit with very many clustered arms.
+
+Both agents run the same trials against Clustered bandits, using the same seed so that trial n of each agent faces the
+same bandit. The flat agent searches every arm on every step it exploits, while the hierarchical agent only searches
+the clusters and then the arms of one cluster. The throughput in steps per second and the final cumulative regret and
+average reward are reported for each. The regrets of the two agents vary a lot from trial to trial, so each is given
+with a 95% confidence interval, along with one for the difference between the agents on the same bandits. Only a
+difference whose interval excludes zero shows that one agent is better.
+"""
+import agent
+import bandit
+import experiment
+import functools
+import numpy
+import statistics
+import time
+
+# How many arms the bandit has.
+K = 1000000
+# How many trials and steps to run for each agent. A few trials are enough to measure the throughput, but many more are
+# needed to tell the regrets apart.
+TRIALS = 32
+STEPS = 2000
+# The exploration rate of both agents.
+EPSILON = 0.1
+# The seed given to both agents' trials.
+SEED = 0
+
+
+def halfWidth(values: numpy.ndarray) -> float:
+    """
+    Find the half width of a 95% confidence interval for the mean of some values, using a normal approximation.
+
+    @param values A one dimensional array of at least two values.
+    @return The half width as a float.
+    """
+    return statistics.NormalDist().inv_cdf(0.975) * float(numpy.std(values, ddof=1)) / numpy.sqrt(values.size)
+
+
+make_bandit = functools.partial(bandit.Clustered, k=K)
+agents = {
+    'flat': functools.partial(agent.EpsilonGreedy, k=K, epsilon=EPSILON),
+    'hierarchical': functools.partial(agent.Hierarchical, k=K, epsilon=EPSILON),
+}
+
+print('{0} arms, {1} trials of {2} steps'.format(K, TRIALS, STEPS))
+print('{0:>14} {1:>14} {2:>22} {3:>16}'.format('agent', 'steps/second', 'final regret', 'average reward'))
+regrets = {}
+for name, make_agent in agents.items():
+    start = time.perf_counter()
+    results = experiment.runTrials(make_agent, make_bandit, trials=TRIALS, steps=STEPS, seed=SEED)
+    elapsed = time.perf_counter() - start
+    regrets[name] = results['regret'][:, -1].astype(numpy.float64)
+    print('{0:>14} {1:>14.0f} {2:>12.1f} +/- {3:>5.1f} {4:>16.3f}'.format(
+        name, TRIALS * STEPS / elapsed, numpy.mean(regrets[name]), halfWidth(regrets[name]),
+        numpy.mean(results['average_reward'][:, -1])))
+difference = regrets['hierarchical'] - regrets['flat']
+print('hierarchical - flat regret on the same bandits: {0:.1f} +/- {1:.1f}'.format(
+    numpy.mean(difference), halfWidth(difference)))
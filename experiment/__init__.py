@@ -0,0 +1,5 @@
+"""
+The experiment module runs agents against bandits and records how well they perform.
+"""
+from .runner import BACKENDS, METRICS, allocateResults, runTrial, runTrials
+from .adaptive import runAdaptive
@@ -0,0 +1,133 @@
+import itertools
+import math
+import numpy
+import statistics
+from agent import BaseAgent
+from bandit import BaseBandit
+from experiment.runner import METRICS, runTrials
+from typing import Callable, Dict, List, Optional
+
+
+def runAdaptive(make_agents: Dict[str, Callable[..., BaseAgent]], make_bandit: Callable[..., BaseBandit], steps: int,
+                precision: float, confidence: float = 0.95, batch_size: int = 100, max_trials: int = 10000,
+                metric: str = 'average_reward', seed=None, backend: str = 'serial',
+                workers: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Compare agents, running only as many trials as needed to tell them apart.
+
+    Each trial is summarized by the final value of a metric, such as the average reward over the whole trial. Trials are
+    run in batches, and every agent in a batch uses the same seed, so they face the same bandits. A pair of agents is
+    compared using the difference between their summaries for each of these shared trials, which removes the variation
+    that comes from the bandits. A pair is resolved once the confidence interval for the mean difference either
+    excludes zero, so one agent is better, or is narrower than precision on each side, so they are equal to within
+    precision. After each batch, more trials are only run for agents that are part of an unresolved pair. This stops
+    when every pair is resolved or when an unresolved pair has reached max_trials. With a single agent, it stops once
+    its own interval is narrower than precision on each side.
+
+    The intervals are checked after every batch, so the chance of a false result is spread over every check as well as
+    every pair. The intervals use a normal approximation, with the confidence split evenly between every pair and each
+    of the ceil(max_trials / batch_size) batches that could be run, so that they all hold at once.
+    @param make_agents A dictionary mapping a name for each agent to a function that takes the keyword argument rng and
+    returns a new instance of that agent, as used by @ref runTrials.
+    @param make_bandit A function that takes the keyword argument rng and returns a new bandit. Every agent uses bandits
+    from this.
+    @param steps The number of steps in each trial. Must be an int greater than zero.
+    @param precision The largest difference in means that does not matter. Must be greater than zero.
+    @param confidence The probability that the intervals for every pair hold after every batch. Must be between 0 and 1
+    (exclusive).
+    @param batch_size The number of trials to run at once for an agent. Must be an int of at least 2.
+    @param max_trials The most trials to run for any agent. Must be an int of at least batch_size.
+    @param metric The name of the metric, from @ref METRICS, to summarize each trial with.
+    @param seed Anything accepted by numpy.random.SeedSequence. Each batch gets its own seed derived from this.
+    @param backend How to run each batch, see @ref runTrials.
+    @param workers The number of threads or processes to run each batch with, see @ref runTrials.
+    @return A dictionary mapping each agent's name to a dictionary holding its 'mean', the 'half_width' of its own
+    confidence interval, the number of 'trials' run, and whether every pair it is part of was 'resolved'.
+    @exception ValueError if any of the inputs are invalid.
+    """
+    if len(make_agents) == 0:
+        raise ValueError('At least one agent must be provided.')
+    if precision <= 0.0:
+        raise ValueError('precision must be greater than zero.')
+    if confidence <= 0.0 or confidence >= 1.0:
+        raise ValueError('confidence must be between 0 and 1 (exclusive).')
+    if not isinstance(batch_size, int) or batch_size < 2:
+        raise ValueError('batch_size must be an integer of at least 2.')
+    if not isinstance(max_trials, int) or max_trials < batch_size:
+        raise ValueError('max_trials must be an integer of at least batch_size.')
+    if metric not in METRICS:
+        raise ValueError('metric must be one of {0}, not {1}'.format(METRICS, metric))
+    names = list(make_agents.keys())
+    pairs = list(itertools.combinations(names, 2))
+    looks = math.ceil(max_trials / batch_size)
+    z = statistics.NormalDist().inv_cdf(1.0 - (1.0 - confidence) / (2 * max(len(pairs), 1) * looks))
+    # The running count, mean and sum of squared differences from the mean of each agent's trial summaries, and of the
+    # differences between the summaries of each pair.
+    agent_moments = {name: [0, 0.0, 0.0] for name in names}
+    pair_moments = {pair: [0, 0.0, 0.0] for pair in pairs}
+    uncertain = set(names)
+    seeds = numpy.random.SeedSequence(seed)
+    while True:
+        # Every agent in the batch is given the same seed, so trial n of each agent faces the same bandit.
+        batch_seed = seeds.spawn(1)[0].generate_state(4)
+        summaries = {}
+        for name in (name for name in names if name in uncertain):
+            results = runTrials(make_agents[name], make_bandit, trials=batch_size, steps=steps, seed=batch_seed,
+                                backend=backend, workers=workers)
+            summaries[name] = results[metric][:, -1].astype(numpy.float64)
+            _merge(agent_moments[name], summaries[name])
+        for first, second in pairs:
+            if first in summaries and second in summaries:
+                _merge(pair_moments[(first, second)], summaries[first] - summaries[second])
+        unresolved = set()
+        uncertain = set()
+        if len(pairs) == 0 and z * _standardError(agent_moments[names[0]]) > precision:
+            unresolved.add(names[0])
+            if agent_moments[names[0]][0] + batch_size <= max_trials:
+                uncertain.add(names[0])
+        for pair in pairs:
+            (_, mean, _) = pair_moments[pair]
+            half_width = z * _standardError(pair_moments[pair])
+            if abs(mean) <= half_width and half_width > precision:
+                unresolved.update(pair)
+                # The pair can only be compared using trials that both agents run.
+                if all(agent_moments[name][0] + batch_size <= max_trials for name in pair):
+                    uncertain.update(pair)
+        if len(uncertain) == 0:
+            break
+    return {name: {
+        'mean': agent_moments[name][1],
+        'half_width': float(z * _standardError(agent_moments[name])),
+        'trials': agent_moments[name][0],
+        'resolved': name not in unresolved,
+    } for name in names}
+
+
+def _merge(moments: List, values: numpy.ndarray) -> None:
+    """
+    Add a batch of values to running moments without keeping every value around.
+
+    @param moments A list holding the count, mean and sum of squared differences from the mean of the values so far.
+    This is updated in place.
+    @param values A one dimensional array of new values.
+    """
+    (count, mean, squares) = moments
+    batch_mean = float(numpy.mean(values))
+    batch_squares = float(numpy.sum((values - batch_mean) ** 2))
+    delta = batch_mean - mean
+    total = count + values.size
+    moments[0] = total
+    moments[1] = mean + delta * values.size / total
+    moments[2] = squares + batch_squares + delta ** 2 * count * values.size / total
+
+
+def _standardError(moments: List) -> float:
+    """
+    Find the standard error of the mean from running moments.
+
+    @param moments A list holding the count, mean and sum of squared differences from the mean, as kept by
+    @ref _merge. The count must be at least 2.
+    @return The standard error as a float.
+    """
+    (count, _, squares) = moments
+    return float(numpy.sqrt(squares / (count - 1) / count))
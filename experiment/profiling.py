@@ -0,0 +1,314 @@
+"""
+Profile a simulation to find where its time goes.
+
+Run this as a module from the root of the repository, for example:
+
+    python -m experiment.profiling --agent epsilon_greedy --bandit random_walk --k 1000
+
+The workload is run twice. The first run is under cProfile, which gives exact call counts and times for every
+function. These are totalled for each part of the package (agent, bandit or experiment) and printed along with the
+functions that take the most time themselves. Time spent in numpy and the rest of Python is charged to the part of the
+package that called it, so the argmax of an agent is kept apart from the argmax of a bandit. The second run is sampled
+from another thread, which records the whole call stack at regular intervals. These stacks are written in the collapsed
+format used by flame graph tools such as flamegraph.pl and speedscope.
+"""
+import agent
+import argparse
+import bandit
+import collections
+import cProfile
+import functools
+import os
+import pstats
+import sys
+import threading
+import time
+from experiment.runner import runTrials
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+## The agents that can be profiled from the command line.
+AGENTS = {
+    'greedy': agent.Greedy,
+    'epsilon_greedy': functools.partial(agent.EpsilonGreedy, epsilon=0.1),
+}
+
+## The bandits that can be profiled from the command line.
+BANDITS = {
+    'normal': bandit.Normal,
+    'random_walk': bandit.RandomWalk,
+    'static': bandit.Static,
+}
+
+## The parts of the package that time is totalled for, in addition to numpy and the rest of Python.
+PACKAGES = ('agent', 'bandit', 'experiment')
+
+# The directory holding each of the packages.
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def componentOf(filename: str, function: str) -> str:
+    """
+    Decide which component a function belongs to.
+
+    @param filename The file the function is defined in, as recorded by cProfile. Built in functions have a filename of
+    '~'.
+    @param function The name of the function, as recorded by cProfile.
+    @return One of @ref PACKAGES, 'numpy', or 'python' for everything else.
+    """
+    if filename == '~':
+        # Built in functions are described by their name alone, such as "<method 'argmax' of 'numpy.ndarray'
+        # objects>".
+        return 'numpy' if 'numpy' in function else 'python'
+    path = os.path.abspath(filename)
+    for package in PACKAGES:
+        if path.startswith(os.path.join(_ROOT, package) + os.sep):
+            return package
+    if 'numpy' in path.split(os.sep):
+        return 'numpy'
+    return 'python'
+
+
+def chargedTo(stats: pstats.Stats) -> Dict[Tuple[str, int, str], Dict[str, float]]:
+    """
+    Decide which part of the package each function's time should be charged to.
+
+    Functions in one of @ref PACKAGES are charged to that package. Any other function, such as a numpy method, is
+    charged to the nearest package that called it, found by following the callers that cProfile records. When it was
+    called from more than one place, its time is split in proportion to the time spent in it from each caller. Time
+    that can not be traced back to a package stays with the function's own component.
+    @param stats The results of a cProfile run.
+    @return A dictionary mapping each function, as keyed in stats.stats, to a dictionary mapping each component its
+    time is charged to, as returned by @ref componentOf, to the fraction charged. The fractions add up to one.
+    """
+    shares = {}
+
+    def share(key, visiting):
+        """
+        Find the charges for one function, without following callers that are already being followed.
+        @return A tuple of the charges and whether every caller was followed, which is when they can be reused.
+        """
+        if key in shares:
+            return (shares[key], True)
+        (filename, _, function) = key
+        component = componentOf(filename, function)
+        callers = stats.stats[key][4] if key in stats.stats else {}
+        edges = [(caller, edge[2], edge[1]) for caller, edge in callers.items() if caller not in visiting]
+        complete = len(edges) == len(callers)
+        if component in PACKAGES or len(edges) == 0:
+            result = {component: 1.0}
+        else:
+            # Weight each caller by the time spent from it, or by its number of calls if no time was measured.
+            weights = [own_time for (_, own_time, _) in edges]
+            if sum(weights) <= 0.0:
+                weights = [calls for (_, _, calls) in edges]
+            total = sum(weights)
+            result = collections.defaultdict(float)
+            for (caller, _, _), weight in zip(edges, weights):
+                (charges, caller_complete) = share(caller, visiting | {key})
+                complete = complete and caller_complete
+                for charged, fraction in charges.items():
+                    result[charged] += fraction * weight / total
+            result = dict(result)
+        if complete:
+            shares[key] = result
+        return (result, complete)
+
+    return {key: share(key, frozenset())[0] for key in stats.stats}
+
+
+def summarize(stats: pstats.Stats) -> Dict[str, Dict[str, float]]:
+    """
+    Total the time charged to each part of the package.
+
+    Only the time spent in each function itself is counted, then charged as described by @ref chargedTo, so the totals
+    add up to the total time of the run.
+    @param stats The results of a cProfile run.
+    @return A dictionary mapping each component time is charged to, which is usually one of @ref PACKAGES, to a
+    dictionary mapping the component the time was actually spent in, such as 'numpy', to the seconds spent there.
+    """
+    totals = collections.defaultdict(lambda: collections.defaultdict(float))
+    for key, charges in chargedTo(stats).items():
+        (filename, _, function) = key
+        own_time = stats.stats[key][2]
+        for charged, fraction in charges.items():
+            totals[charged][componentOf(filename, function)] += own_time * fraction
+    return {charged: dict(spent) for charged, spent in totals.items()}
+
+
+def hotFunctions(stats: pstats.Stats, count: int) -> Sequence[Tuple[str, str, str, int, float, float]]:
+    """
+    Find the functions that take the most time themselves.
+
+    A function whose time is charged to more than one part of the package, as described by @ref chargedTo, has a
+    separate row for each part, so that the same numpy method used by an agent and a bandit shows up twice.
+    @param stats The results of a cProfile run.
+    @param count The most rows to return.
+    @return A list of tuples, each holding the function's name, its component, the component its time is charged to,
+    the number of calls, the seconds spent in the function itself, and the seconds spent in it and everything it
+    calls. The times of a split function are divided in the same proportion as its time is charged, and its calls are
+    divided between the callers that made them. The list is sorted by the time spent in the function itself, largest
+    first.
+    """
+    shares = chargedTo(stats)
+    rows = []
+    for key, charges in shares.items():
+        (filename, line, function) = key
+        (_, calls, own_time, total_time, callers) = stats.stats[key]
+        name = function if filename == '~' else '{0}:{1}({2})'.format(os.path.basename(filename), line, function)
+        # Each caller's calls are charged in the same way as the caller itself.
+        charged_calls = collections.defaultdict(float)
+        for caller, edge in callers.items():
+            for charged, fraction in shares.get(caller, {}).items():
+                charged_calls[charged] += edge[1] * fraction
+        for charged, fraction in charges.items():
+            charged_count = calls if len(charges) == 1 else int(round(charged_calls[charged]))
+            rows.append((name, componentOf(filename, function), charged, charged_count, own_time * fraction,
+                         total_time * fraction))
+    rows.sort(key=lambda row: row[4], reverse=True)
+    return rows[:count]
+
+
+class StackSampler:
+    """
+    Record the call stack of a thread at regular intervals.
+
+    The stacks are kept in the collapsed format, where each stack is a single string of frames from the outermost to
+    the innermost, separated by semicolons. Each frame is named by its module and function. The number of times each
+    stack was seen is proportional to the time spent in it.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        """
+        Set up the sampler.
+
+        @param interval The number of seconds to wait between samples. Must be greater than zero.
+        @exception ValueError if interval is not greater than zero.
+        """
+        if interval <= 0.0:
+            raise ValueError('interval must be greater than zero.')
+        self._interval = interval
+        self._stacks = collections.Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def stacks(self) -> Dict[str, int]:
+        """
+        Return the stacks recorded so far.
+        @return A dictionary mapping each collapsed stack to the number of times it was seen.
+        """
+        return dict(self._stacks)
+
+    def __enter__(self) -> 'StackSampler':
+        """
+        Start sampling the calling thread.
+        """
+        target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, args=(target,), daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        """
+        Stop sampling.
+        """
+        self._stop.set()
+        self._thread.join()
+
+    def _sample(self, target: int) -> None:
+        """
+        Record the stack of the target thread until told to stop.
+
+        @param target The identifier of the thread to sample.
+        """
+        while not self._stop.wait(self._interval):
+            frame = sys._current_frames().get(target)
+            names = []
+            while frame is not None:
+                module = frame.f_globals.get('__name__', '?')
+                names.append('{0}:{1}'.format(module, frame.f_code.co_name))
+                frame = frame.f_back
+            if len(names) > 0:
+                self._stacks[';'.join(reversed(names))] += 1
+
+
+def profileRun(make_agent: Callable, make_bandit: Callable, trials: int, steps: int,
+               interval: float = 0.001) -> Tuple[pstats.Stats, Dict[str, int]]:
+    """
+    Profile a set of trials, as run by @ref runTrials.
+
+    @param make_agent A function that takes the keyword argument rng and returns a new agent.
+    @param make_bandit A function that takes the keyword argument rng and returns a new bandit.
+    @param trials The number of trials to run.
+    @param steps The number of steps in each trial.
+    @param interval The number of seconds between samples of the call stack.
+    @return A tuple holding the results of the cProfile run and the collapsed stacks from the sampled run, as given by
+    @ref StackSampler.stacks.
+    """
+    profiler = cProfile.Profile()
+    profiler.enable()
+    runTrials(make_agent, make_bandit, trials=trials, steps=steps, seed=0)
+    profiler.disable()
+    stats = pstats.Stats(profiler)
+    with StackSampler(interval=interval) as sampler:
+        runTrials(make_agent, make_bandit, trials=trials, steps=steps, seed=0)
+    return (stats, sampler.stacks)
+
+
+def writeCollapsed(stacks: Dict[str, int], path: str) -> None:
+    """
+    Write stacks to a file in the collapsed format.
+
+    Each line holds a stack followed by a space and the number of times it was seen.
+    @param stacks A dictionary mapping each collapsed stack to a count, as given by @ref StackSampler.stacks.
+    @param path The file to write to.
+    """
+    with open(path, 'w') as output:
+        for stack, count in sorted(stacks.items()):
+            output.write('{0} {1}\n'.format(stack, count))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """
+    Profile a workload described on the command line and report the results.
+
+    @param argv The command line arguments, not including the program name. Defaults to those given to Python.
+    """
+    parser = argparse.ArgumentParser(prog='python -m experiment.profiling', description=__doc__.strip().split('\n')[0])
+    parser.add_argument('--agent', choices=sorted(AGENTS), default='epsilon_greedy', help='the agent to run')
+    parser.add_argument('--bandit', choices=sorted(BANDITS), default='normal', help='the bandit to run against')
+    parser.add_argument('--k', type=int, default=10, help='the number of arms')
+    parser.add_argument('--trials', type=int, default=100, help='the number of trials')
+    parser.add_argument('--steps', type=int, default=1000, help='the number of steps in each trial')
+    parser.add_argument('--interval', type=float, default=0.001, help='the seconds between stack samples')
+    parser.add_argument('--top', type=int, default=15, help='the number of hot functions to list')
+    parser.add_argument('--output', default='profile.folded', help='the file to write collapsed stacks to')
+    arguments = parser.parse_args(argv)
+    make_agent = functools.partial(AGENTS[arguments.agent], k=arguments.k)
+    make_bandit = functools.partial(BANDITS[arguments.bandit], k=arguments.k)
+    start = time.perf_counter()
+    (stats, stacks) = profileRun(make_agent, make_bandit, arguments.trials, arguments.steps,
+                                 interval=arguments.interval)
+    elapsed = time.perf_counter() - start
+    totals = summarize(stats)
+    total_time = sum(sum(spent.values()) for spent in totals.values())
+    print('Profiled {0} trials of {1} steps in {2:.2f} seconds.\n'.format(arguments.trials, arguments.steps, elapsed))
+    # Each part of the package is charged for the numpy and Python functions it calls, which are also shown apart.
+    print('{0:<12} {1:>10} {2:>10} {3:>10} {4:>10} {5:>8}'.format('component', 'own s', 'numpy s', 'python s',
+                                                                  'total s', 'percent'))
+    for component, spent in sorted(totals.items(), key=lambda item: sum(item[1].values()), reverse=True):
+        own = sum(seconds for where, seconds in spent.items() if where not in ('numpy', 'python'))
+        seconds = sum(spent.values())
+        print('{0:<12} {1:>10.3f} {2:>10.3f} {3:>10.3f} {4:>10.3f} {5:>7.1f}%'.format(
+            component, own, spent.get('numpy', 0.0), spent.get('python', 0.0), seconds, 100 * seconds / total_time))
+    print('\n{0:<60} {1:<10} {2:<10} {3:>10} {4:>10} {5:>10}'.format('function', 'component', 'charged to', 'calls',
+                                                                     'own s', 'total s'))
+    for row in hotFunctions(stats, arguments.top):
+        print('{0:<60.60} {1:<10} {2:<10} {3:>10} {4:>10.3f} {5:>10.3f}'.format(*row))
+    writeCollapsed(stacks, arguments.output)
+    print('\nWrote {0} sampled stacks to {1}.'.format(sum(stacks.values()), arguments.output))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+import concurrent.futures
+import numpy
+import os
+from agent import BaseAgent
+from bandit import BaseBandit
+from typing import Callable, Dict, Optional
+
+## The metrics recorded at each step of a trial.
+#
+# - reward: The reward received at that step.
+# - average_reward: The mean of all rewards received up to and including that step.
+# - regret: The total, up to and including that step, of how much less reward was received than the expected reward of
+# the best arm at the time.
+# - optimal_action: 1.0 if the best arm was selected at that step, 0.0 otherwise. Averaging this across trials gives the
+# rate at which the best arm is selected.
+METRICS = ('reward', 'average_reward', 'regret', 'optimal_action')
+
+## The ways trials can be run.
+#
+# - serial: All trials are run one after the other in this thread.
+# - thread: The trials are split between a pool of threads. Each thread writes directly into its own rows of the
+# results, so nothing is copied. Most of the time spent in a step with many arms is inside numpy, which lets other
+# threads run in the meantime.
+# - process: The trials are split between a pool of processes. Each process returns its rows, which are then copied
+# into the results. The agent and bandit functions must be able to be pickled, so use module level functions or
+# functools.partial rather than lambdas.
+BACKENDS = ('serial', 'thread', 'process')
+
+
+def allocateResults(trials: int, steps: int, dtype=numpy.float64) -> Dict[str, numpy.ndarray]:
+    """
+    Create the arrays to hold every metric for a set of trials.
+
+    @param trials The number of trials to hold results for.
+    @param steps The number of steps in each trial.
+    @param dtype The floating point type of the arrays. float32 halves the memory used compared to float64.
+    @return A dictionary mapping each name in @ref METRICS to a numpy array of shape (trials, steps).
+    """
+    return {name: numpy.zeros(shape=(trials, steps), dtype=dtype) for name in METRICS}
+
+
+def runTrial(agent: BaseAgent, bandit: BaseBandit, steps: int,
+             results: Optional[Dict[str, numpy.ndarray]] = None) -> Dict[str, numpy.ndarray]:
+    """
+    Let an agent select arms from a bandit a number of times, recording the metrics along the way.
+
+    The best arm is read from the bandit's @ref BaseBandit.optimalAction and @ref BaseBandit.optimalValue methods, so
+    this does no extra searching of the arms at each step. The running totals are computed once the trial is over.
+    @param agent The agent to select arms. It is used as is, so reset it first if needed.
+    @param bandit The bandit to select arms from. It must implement optimalAction and optimalValue.
+    @param steps The number of times to select an arm.
+    @param results If provided, a dictionary with a one dimensional array of length steps for each name in @ref
+    METRICS. The metrics are written directly into these arrays. This allows writing into a row of the arrays from @ref
+    allocateResults without copying.
+    @return The dictionary of metrics, each a numpy array of length steps.
+    """
+    if results is None:
+        results = {name: values[0] for name, values in allocateResults(1, steps).items()}
+    rewards = results['reward']
+    regret = results['regret']
+    optimal_action = results['optimal_action']
+    for m in range(steps):
+        # Selecting an arm can change the bandit, so find the best arm first.
+        best_action = bandit.optimalAction()
+        best_value = bandit.optimalValue()
+        action = agent.act()
+        reward = bandit.select(action)
+        agent.update(action=action, reward=reward)
+        rewards[m] = reward
+        regret[m] = best_value - reward
+        optimal_action[m] = (action == best_action)
+    numpy.cumsum(regret, out=regret)
+    average_reward = results['average_reward']
+    numpy.cumsum(rewards, out=average_reward)
+    average_reward /= numpy.arange(1, steps + 1)
+    return results
+
+
+def runTrials(make_agent: Callable[..., BaseAgent], make_bandit: Callable[..., BaseBandit], trials: int,
+              steps: int, dtype=numpy.float64, seed=None, backend: str = 'serial',
+              workers: Optional[int] = None) -> Dict[str, numpy.ndarray]:
+    """
+    Run several independent trials and record the metrics for each.
+
+    Each trial uses a new agent and a new bandit. The trials are split into one contiguous slice for each worker. Each
+    worker has its own random number generators, one passed to the agents it creates and one to the bandits. So the
+    results are repeatable for a given seed and number of workers, and different agents run with the same seed face the
+    same bandits.
+    @param make_agent A function that takes a numpy random Generator as the keyword argument rng and returns a new
+    agent. For example, functools.partial(agent.Greedy, k=10).
+    @param make_bandit A function that takes a numpy random Generator as the keyword argument rng and returns a new
+    bandit.
+    @param trials The number of trials to run. Must be an int greater than zero.
+    @param steps The number of steps in each trial. Must be an int greater than zero.
+    @param dtype The floating point type of the results.
+    @param seed A numpy.random.SeedSequence, or anything it accepts, used to create each worker's random number
+    generator. If not provided, fresh entropy is used.
+    @param backend One of @ref BACKENDS, which controls how the trials are run.
+    @param workers The number of threads or processes to use. Defaults to the number of CPUs. This is ignored by the
+    serial backend.
+    @return A dictionary mapping each name in @ref METRICS to a numpy array of shape (trials, steps). Row n holds the
+    metric for trial n.
+    @exception ValueError if trials, steps or workers are not ints greater than zero or if backend is not valid.
+    """
+    if not isinstance(trials, int) or trials <= 0:
+        raise ValueError('trials must be an integer greater than zero.')
+    if not isinstance(steps, int) or steps <= 0:
+        raise ValueError('steps must be an integer greater than zero.')
+    if backend not in BACKENDS:
+        raise ValueError('backend must be one of {0}, not {1}'.format(BACKENDS, backend))
+    if backend == 'serial':
+        workers = 1
+    elif workers is None:
+        workers = os.cpu_count() or 1
+    elif not isinstance(workers, int) or workers <= 0:
+        raise ValueError('workers must be an integer greater than zero.')
+    workers = min(workers, trials)
+    results = allocateResults(trials, steps, dtype=dtype)
+    if not isinstance(seed, numpy.random.SeedSequence):
+        seed = numpy.random.SeedSequence(seed)
+    seeds = seed.spawn(workers)
+    bounds = numpy.linspace(0, trials, workers + 1).astype(int)
+    slices = [{name: values[bounds[i]:bounds[i + 1]] for name, values in results.items()} for i in range(workers)]
+    if backend == 'serial':
+        _runSlice(make_agent, make_bandit, steps, seeds[0], slices[0])
+    elif backend == 'thread':
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_runSlice, make_agent, make_bandit, steps, seeds[i], slices[i])
+                       for i in range(workers)]
+            for future in futures:
+                future.result()
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_runSliceCopy, make_agent, make_bandit, int(bounds[i + 1] - bounds[i]), steps,
+                                       dtype, seeds[i]) for i in range(workers)]
+            for i, future in enumerate(futures):
+                for name, values in future.result().items():
+                    slices[i][name][:] = values
+    return results
+
+
+def _runSlice(make_agent: Callable[..., BaseAgent], make_bandit: Callable[..., BaseBandit], steps: int,
+              seed: numpy.random.SeedSequence, results: Dict[str, numpy.ndarray]) -> None:
+    """
+    Run a contiguous group of trials with their own random number generator.
+
+    @param make_agent A function that takes the keyword argument rng and returns a new agent.
+    @param make_bandit A function that takes the keyword argument rng and returns a new bandit.
+    @param steps The number of steps in each trial.
+    @param seed The seed for the random number generators shared by this group of trials.
+    @param results A dictionary with a two dimensional array for each name in @ref METRICS. There is a row for each
+    trial, which is written to directly.
+    """
+    # The agents and bandits have separate generators, so the bandits draw the same values whatever the agents do. This
+    # lets different agents run with the same seed face exactly the same bandits.
+    (agent_rng, bandit_rng) = (numpy.random.default_rng(s) for s in seed.spawn(2))
+    trials = results['reward'].shape[0]
+    for n in range(trials):
+        rows = {name: values[n] for name, values in results.items()}
+        runTrial(make_agent(rng=agent_rng), make_bandit(rng=bandit_rng), steps, results=rows)
+
+
+def _runSliceCopy(make_agent: Callable[..., BaseAgent], make_bandit: Callable[..., BaseBandit], trials: int,
+                  steps: int, dtype, seed: numpy.random.SeedSequence) -> Dict[str, numpy.ndarray]:
+    """
+    Run a contiguous group of trials in their own results, for use in another process.
+
+    @param trials The number of trials to run.
+    @param dtype The floating point type of the results.
+    @return The results, as returned by @ref runTrials.
+    @see _runSlice for the remaining parameters.
+    """
+    results = allocateResults(trials, steps, dtype=dtype)
+    _runSlice(make_agent, make_bandit, steps, seed, results)
+    return results
@@ -0,0 +1,133 @@
+from agent import BaseAgent
+from bandit import Normal
+import experiment
+import unittest
+
+
+class FixedAgent(BaseAgent):
+    """
+    An agent that always selects the same arm, so its expected reward is known.
+    """
+
+    def __init__(self, k: int, arm: int, rng=None) -> None:
+        super().__init__(k, rng=rng)
+        self._arm = arm
+
+    def act(self) -> int:
+        return self._arm
+
+    def update(self, action: int, reward: float) -> None:
+        pass
+
+
+def makeBandit(rng) -> Normal:
+    """
+    Create a bandit where arm 1 is far better than arm 0, and arm 2 is as good as arm 0 but twice as noisy.
+    """
+    bandit = Normal(k=3, rng=rng)
+    bandit._mean[:] = (0.0, 5.0, 0.0)
+    bandit._std[:] = (1.0, 1.0, 2.0)
+    bandit._optimal_action = 1
+    return bandit
+
+
+class TestAdaptive(unittest.TestCase):
+    """
+    Test the experiment runner that stops once agents can be told apart.
+    """
+
+    def test_reallocation(self):
+        """
+        Test that trials are only added for agents that can't be told apart yet.
+
+        The agent on the better arm is clearly separated after the first batch, so it should stop there. The two
+        agents on arms with the same mean can never be told apart to such a fine precision, so they should run until the
+        limit.
+        """
+        make_agents = {
+            'low': lambda rng: FixedAgent(k=3, arm=0, rng=rng),
+            'also_low': lambda rng: FixedAgent(k=3, arm=2, rng=rng),
+            'high': lambda rng: FixedAgent(k=3, arm=1, rng=rng),
+        }
+        # Use a fixed seed so the number of trials run is repeatable.
+        summary = experiment.runAdaptive(make_agents, makeBandit, steps=10, precision=0.001, confidence=0.99,
+                                         batch_size=20, max_trials=100, seed=0)
+        self.assertEqual(summary['high']['trials'], 20)
+        self.assertTrue(summary['high']['resolved'])
+        for name in ('low', 'also_low'):
+            self.assertEqual(summary[name]['trials'], 100)
+            self.assertFalse(summary[name]['resolved'])
+            self.assertAlmostEqual(summary[name]['mean'], 0.0, delta=summary[name]['half_width'])
+        self.assertAlmostEqual(summary['high']['mean'], 5.0, delta=summary['high']['half_width'])
+
+    def test_precision(self):
+        """
+        Test that agents that are equal to within the precision stop after the first batch.
+        """
+        make_agents = {
+            'low': lambda rng: FixedAgent(k=3, arm=0, rng=rng),
+            'also_low': lambda rng: FixedAgent(k=3, arm=2, rng=rng),
+        }
+        summary = experiment.runAdaptive(make_agents, makeBandit, steps=10, precision=10.0, batch_size=20, seed=0)
+        for name in make_agents:
+            self.assertEqual(summary[name]['trials'], 20)
+            self.assertTrue(summary[name]['resolved'])
+
+    def test_common_bandits(self):
+        """
+        Test that agents are compared on the same bandits.
+
+        Two agents that behave identically get exactly the same rewards, so their differences are all zero and they are
+        equal to within any precision after the first batch, even though each agent's own interval is wide.
+        """
+        make_agents = {
+            'first': lambda rng: FixedAgent(k=3, arm=2, rng=rng),
+            'second': lambda rng: FixedAgent(k=3, arm=2, rng=rng),
+        }
+        summary = experiment.runAdaptive(make_agents, makeBandit, steps=10, precision=0.001, batch_size=20, seed=0)
+        self.assertEqual(summary['first']['mean'], summary['second']['mean'])
+        for name in make_agents:
+            self.assertEqual(summary[name]['trials'], 20)
+            self.assertTrue(summary[name]['resolved'])
+            self.assertGreater(summary[name]['half_width'], 0.001)
+
+    def test_false_separation(self):
+        """
+        Test that agents that are equally good are rarely found to be different, even though they are checked after
+        every batch.
+
+        The precision is too fine to ever be reached, so every comparison that is resolved is a false separation. This
+        should happen in no more than 1 - confidence of the comparisons.
+        """
+        make_agents = {
+            'low': lambda rng: FixedAgent(k=3, arm=0, rng=rng),
+            'also_low': lambda rng: FixedAgent(k=3, arm=2, rng=rng),
+        }
+        repeats = 200
+        separated = 0
+        for seed in range(repeats):
+            summary = experiment.runAdaptive(make_agents, makeBandit, steps=1, precision=1e-9, confidence=0.9,
+                                             batch_size=20, max_trials=200, seed=seed)
+            separated += summary['low']['resolved']
+        self.assertLessEqual(separated / repeats, 0.1)
+
+    def test_invalid_inputs(self):
+        """
+        Test that invalid settings are rejected.
+        """
+        make_agents = {'low': lambda rng: FixedAgent(k=3, arm=0, rng=rng)}
+        invalid_settings = (
+            {'precision': 0.0},
+            {'confidence': 1.0},
+            {'batch_size': 1},
+            {'max_trials': 10, 'batch_size': 20},
+            {'metric': 'other'},
+        )
+        for settings in invalid_settings:
+            options = {'precision': 0.1}
+            options.update(settings)
+            with self.subTest(settings=settings):
+                with self.assertRaises(ValueError):
+                    experiment.runAdaptive(make_agents, makeBandit, steps=10, **options)
+        with self.assertRaises(ValueError):
+            experiment.runAdaptive({}, makeBandit, steps=10, precision=0.1)
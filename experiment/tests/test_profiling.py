@@ -0,0 +1,90 @@
+from agent import EpsilonGreedy
+from bandit import Normal, RandomWalk
+from experiment import profiling
+import contextlib
+import functools
+import io
+import numpy
+import os
+import tempfile
+import unittest
+
+
+class TestProfiling(unittest.TestCase):
+    """
+    Test the tools for profiling a simulation.
+    """
+
+    def test_component(self):
+        """
+        Test that functions are assigned to the right component.
+        """
+        agent_file = os.path.join(profiling._ROOT, 'agent', 'base_agent.py')
+        self.assertEqual(profiling.componentOf(agent_file, 'exploit'), 'agent')
+        bandit_file = os.path.join(profiling._ROOT, 'bandit', 'normal.py')
+        self.assertEqual(profiling.componentOf(bandit_file, 'select'), 'bandit')
+        self.assertEqual(profiling.componentOf(numpy.__file__, 'argmax'), 'numpy')
+        self.assertEqual(profiling.componentOf('~', "<method 'argmax' of 'numpy.ndarray' objects>"), 'numpy')
+        self.assertEqual(profiling.componentOf('~', '<built-in method builtins.isinstance>'), 'python')
+        self.assertEqual(profiling.componentOf(os.__file__, 'join'), 'python')
+
+    def test_profile_run(self):
+        """
+        Test that a run records time in the agent and bandit and samples some stacks.
+        """
+        make_agent = functools.partial(EpsilonGreedy, k=10, epsilon=0.1)
+        make_bandit = functools.partial(Normal, k=10)
+        (stats, stacks) = profiling.profileRun(make_agent, make_bandit, trials=5, steps=2000, interval=0.0005)
+        totals = profiling.summarize(stats)
+        for component in ('agent', 'bandit', 'experiment'):
+            self.assertGreater(totals[component][component], 0.0)
+        # Charging time to callers moves it around, but none is lost.
+        total_time = sum(sum(spent.values()) for spent in totals.values())
+        self.assertAlmostEqual(total_time, sum(row[2] for row in stats.stats.values()))
+        rows = profiling.hotFunctions(stats, 5)
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(sorted(rows, key=lambda row: row[4], reverse=True), rows)
+        self.assertGreater(len(stacks), 0)
+        # Every sampled stack should be made of semicolon separated frames.
+        for stack in stacks:
+            self.assertNotIn(' ', stack)
+
+    def test_charged_to(self):
+        """
+        Test that numpy calls are charged to the part of the package that made them.
+
+        Both the agent and the random walk bandit call numpy's argmax on every step, and these should be kept apart.
+        """
+        make_agent = functools.partial(EpsilonGreedy, k=100, epsilon=0.1)
+        make_bandit = functools.partial(RandomWalk, k=100)
+        (stats, _) = profiling.profileRun(make_agent, make_bandit, trials=2, steps=500)
+        totals = profiling.summarize(stats)
+        self.assertGreater(totals['agent'].get('numpy', 0.0), 0.0)
+        self.assertGreater(totals['bandit'].get('numpy', 0.0), 0.0)
+        rows = [row for row in profiling.hotFunctions(stats, len(stats.stats) * 3) if row[0] == "<method 'argmax' of "
+                "'numpy.ndarray' objects>"]
+        charged = {row[2]: row[3] for row in rows}
+        # The bandit searches for its best arm on every step, and once more when each one is created. The agent only
+        # searches when it exploits.
+        self.assertGreaterEqual(charged['bandit'], 1000)
+        self.assertLessEqual(charged['bandit'], 1002)
+        self.assertGreater(charged['agent'], 0)
+        self.assertLess(charged['agent'], 1000)
+        for row in rows:
+            self.assertEqual(row[1], 'numpy')
+
+    def test_main(self):
+        """
+        Test that the command line entry point writes collapsed stacks.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.folded')
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                profiling.main(['--agent', 'greedy', '--bandit', 'static', '--trials', '2', '--steps', '5000',
+                                '--output', path])
+            self.assertIn('component', output.getvalue())
+            with open(path) as folded:
+                for line in folded:
+                    (stack, count) = line.rsplit(' ', 1)
+                    self.assertGreater(int(count), 0)
+                    self.assertIn(';', stack)
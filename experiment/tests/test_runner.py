@@ -0,0 +1,100 @@
+from agent import Greedy
+from bandit import RandomWalk, Replay, Static
+import experiment
+import functools
+import numpy
+import unittest
+
+
+class TestRunner(unittest.TestCase):
+    """
+    Test the functions that run agents against bandits and record metrics.
+    """
+
+    def test_metrics(self):
+        """
+        Test that the metrics are correct for a known sequence of actions.
+
+        A greedy agent on a static bandit with starting values above every reward will try each arm once, in order of
+        the starting values, then stick with the best one. So every metric can be worked out by hand.
+        """
+        bandit = Static(k=3, rewards=(0.5, 1.0, 0.0))
+        agent = Greedy(k=3)
+        agent._table[:] = (12.0, 11.0, 10.0)
+        results = experiment.runTrial(agent, bandit, steps=5)
+        self.assertEqual(set(results.keys()), set(experiment.METRICS))
+        numpy.testing.assert_array_equal(results['reward'], [0.5, 1.0, 0.0, 1.0, 1.0])
+        numpy.testing.assert_array_equal(results['optimal_action'], [0.0, 1.0, 0.0, 1.0, 1.0])
+        numpy.testing.assert_allclose(results['regret'], [0.5, 0.5, 1.5, 1.5, 1.5])
+        numpy.testing.assert_allclose(results['average_reward'], [0.5, 0.75, 0.5, 0.625, 0.7])
+
+    def test_trials(self):
+        """
+        Test that multiple trials fill in a row each and that invalid sizes are rejected.
+        """
+        TRIALS = 4
+        STEPS = 20
+        make_agent = functools.partial(Greedy, k=5)
+        make_bandit = functools.partial(Static, k=5)
+        results = experiment.runTrials(make_agent, make_bandit, trials=TRIALS, steps=STEPS)
+        for name in experiment.METRICS:
+            self.assertEqual(results[name].shape, (TRIALS, STEPS))
+        # A static bandit always gives non-negative rewards below 1, so this should show up in every row.
+        self.assertTrue((results['reward'] >= 0.0).all())
+        self.assertTrue((results['reward'] < 1.0).all())
+        # Results can use a smaller type.
+        results = experiment.runTrials(make_agent, make_bandit, trials=TRIALS, steps=STEPS, dtype=numpy.float32)
+        for name in experiment.METRICS:
+            self.assertEqual(results[name].dtype, numpy.float32)
+        for trials, steps in ((0, 10), (10, 0), (-1, 10), (1.5, 10)):
+            with self.assertRaises(ValueError, msg='Invalid trial size not rejected.'):
+                experiment.runTrials(make_agent, make_bandit, trials=trials, steps=steps)
+
+    def test_backends(self):
+        """
+        Test that every backend fills in every row and that results are repeatable.
+
+        With the same seed and number of workers, each worker uses the same random numbers, so the threads and
+        processes should produce exactly the same results.
+        """
+        make_agent = functools.partial(Greedy, k=5, start_value=1.0)
+        make_bandit = functools.partial(RandomWalk, k=5)
+        serial = experiment.runTrials(make_agent, make_bandit, trials=5, steps=10, seed=1)
+        repeat = experiment.runTrials(make_agent, make_bandit, trials=5, steps=10, seed=1)
+        threads = experiment.runTrials(make_agent, make_bandit, trials=5, steps=10, seed=1, backend='thread',
+                                       workers=2)
+        processes = experiment.runTrials(make_agent, make_bandit, trials=5, steps=10, seed=1, backend='process',
+                                         workers=2)
+        for name in experiment.METRICS:
+            numpy.testing.assert_array_equal(serial[name], repeat[name])
+            numpy.testing.assert_array_equal(threads[name], processes[name])
+        # Every trial should have received some reward.
+        self.assertTrue((threads['reward'] != 0.0).any(axis=1).all())
+        for backend, workers in (('other', 2), ('thread', 0), ('process', -1)):
+            with self.assertRaises(ValueError, msg='Invalid backend not rejected.'):
+                experiment.runTrials(make_agent, make_bandit, trials=5, steps=10, backend=backend, workers=workers)
+
+    def test_replay(self):
+        """
+        Test that trials can be run against a log, with each trial using its own part of it.
+
+        The log has a single arm and the reward of each entry is its position. Each trial starts from a different
+        shard of the log, so each should receive the reward of the first entry in its shard.
+        """
+        arms = numpy.zeros(shape=(20,), dtype=numpy.int64)
+        rewards = numpy.arange(arms.size, dtype=numpy.float64)
+        with Replay(1, arms, rewards) as log:
+            true_values = log.trueValues()
+        shards = iter(range(0, arms.size, 5))
+
+        def makeBandit(rng):
+            start = next(shards)
+            return Replay(1, arms, rewards, start=start, stop=start + 5, true_values=true_values, rng=rng)
+
+        make_agent = functools.partial(Greedy, k=1)
+        results = experiment.runTrials(make_agent, makeBandit, trials=4, steps=2, seed=0)
+        numpy.testing.assert_array_equal(results['reward'], [[0.0, 1.0], [5.0, 6.0], [10.0, 11.0], [15.0, 16.0]])
+        # The partial form used for other bandits also works.
+        results = experiment.runTrials(make_agent, functools.partial(Replay, 1, arms, rewards, true_values=true_values),
+                                       trials=2, steps=2, seed=0)
+        numpy.testing.assert_array_equal(results['reward'], [[0.0, 1.0], [0.0, 1.0]])